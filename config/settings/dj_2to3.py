@@ -1,7 +1,75 @@
 """All settings of dj_2to3."""
 
+import os
+from pathlib import Path
+
 from .django import INSTALLED_APPS
+from .utils import BASE_DIR, env
 
 INSTALLED_APPS.append("dj_2to3")
 
 AUTH_USER_MODEL = "dj_2to3.User"
+
+# The maximum number of external processes run concurrently by an analysis
+DJ_2TO3_WORKERS = env.int("DJ_2TO3_WORKERS", default=os.cpu_count() or 1)
+
+# The maximum number of external processes run concurrently by the asynchronous runner
+DJ_2TO3_ASYNC_CONCURRENCY = env.int(
+    "DJ_2TO3_ASYNC_CONCURRENCY", default=os.cpu_count() or 1
+)
+
+# The seconds after which an external process run asynchronously is killed, 0 for never
+DJ_2TO3_SUBPROCESS_TIMEOUT = env.int("DJ_2TO3_SUBPROCESS_TIMEOUT", default=3600)
+
+# The bytes of the output of an external process held in memory before it is spooled to
+# a temporary file on disk
+DJ_2TO3_SPOOL_SIZE = env.int("DJ_2TO3_SPOOL_SIZE", default=8 << 20)
+
+# The number of jobs run by a warm worker of a Python executable before it is replaced,
+# 0 to run every script by a new process instead
+DJ_2TO3_WORKER_MAX_JOBS = env.int("DJ_2TO3_WORKER_MAX_JOBS", default=100)
+
+# The seconds after which an idle warm worker of a Python executable is stopped
+DJ_2TO3_WORKER_IDLE_TIMEOUT = env.int("DJ_2TO3_WORKER_IDLE_TIMEOUT", default=300)
+
+# The seconds between the heartbeats of a running job
+DJ_2TO3_JOB_HEARTBEAT = env.int("DJ_2TO3_JOB_HEARTBEAT", default=30)
+
+# The seconds without a heartbeat after which a running job is failed, because its
+# worker is gone
+DJ_2TO3_JOB_TIMEOUT = env.int("DJ_2TO3_JOB_TIMEOUT", default=300)
+
+# Run the fixes by the server itself when it is compatible with the Python executable
+DJ_2TO3_IN_PROCESS = env.bool("DJ_2TO3_IN_PROCESS", default=True)
+
+# The directory of the on-disk caches, which can be shared between nodes
+DJ_2TO3_CACHE_DIR = env.path("DJ_2TO3_CACHE_DIR", default=BASE_DIR / ".cache")
+
+# The maximum size in bytes of the cache of the diffs of the files by the fixes
+DJ_2TO3_FRAGMENT_CACHE_SIZE = env.int("DJ_2TO3_FRAGMENT_CACHE_SIZE", default=1 << 30)
+
+# The directory of the content-addressed store of the big diffs
+DJ_2TO3_BLOB_DIR = env.path("DJ_2TO3_BLOB_DIR", default=BASE_DIR / "blobs")
+
+# The size in bytes from which the diff of a project fix is saved in the blob store
+# instead of the database
+DJ_2TO3_BLOB_THRESHOLD = env.int("DJ_2TO3_BLOB_THRESHOLD", default=1 << 20)
+
+# The directories scanned for the Python executables
+DJ_2TO3_DISCOVERY_ROOTS = env.list(
+    "DJ_2TO3_DISCOVERY_ROOTS", default=[str(Path.home())]
+)
+
+# The names of the directories skipped by the discovery of the Python executables
+DJ_2TO3_DISCOVERY_EXCLUDES = env.list(
+    "DJ_2TO3_DISCOVERY_EXCLUDES",
+    default=[
+        ".git",
+        ".hg",
+        ".svn",
+        "__pycache__",
+        "dist-packages",
+        "node_modules",
+        "site-packages",
+    ],
+)
@@ -23,6 +23,7 @@ from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("dj_2to3/", include("dj_2to3.urls")),
 ]
 
 if settings.DEBUG:
@@ -2,7 +2,9 @@
 
 from .fix import FixAdmin
 from .future import FutureAdmin
+from .job import JobAdmin
 from .project import ProjectAdmin
 from .project_fix import ProjectFixAdmin
+from .project_fix_file import ProjectFixFileAdmin
 from .python import PythonExecutableAdmin
 from .user import UserAdmin
@@ -2,15 +2,13 @@
 
 from typing import Optional
 
-from django.contrib import admin, messages
+from django.contrib import admin
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
-from django.urls import reverse
-from django.utils.html import format_html
-from django.utils.translation import gettext as _
 
-from ..models import Fix, Future, PythonExecutable
+from ..models import Fix, Future, Job, PythonExecutable
+from .job import enqueue_jobs
 
 
 class FixInline(
@@ -98,9 +96,8 @@ class FutureAdmin(
 
     @admin.action(description="Load Fixes")
     def load_fixes(self, request: HttpRequest, queryset: QuerySet[Future]) -> None:
-        """Create fixes."""
-        for future in queryset:
-            future.load_fixes()
+        """Enqueue the loads of the fixes."""
+        enqueue_jobs(self, request, Job.Action.LOAD_FIXES, queryset)
 
     def has_add_permission(
         self,
@@ -118,24 +115,8 @@ class FutureAdmin(
             request, preserved_filters
         )
 
-        msg_dict = {
-            "obj_future": format_html(
-                '<a href="{}">{}</a>',
-                reverse("admin:dj_2to3_future_change", args=[obj.pk]),
-                obj,
-            ),
-        }
         if "_load_fixes" in request.POST:
-            fixes = obj.load_fixes()
-            msg = format_html(
-                _(
-                    "The {no_fixes} fixes was loaded successfully from the future "
-                    '"{obj_future}".'
-                ),
-                no_fixes=len(fixes) if fixes else 0,
-                **msg_dict,
-            )
-            self.message_user(request, msg, messages.SUCCESS)
+            enqueue_jobs(self, request, Job.Action.LOAD_FIXES, [obj])
             redirect_url = request.path
             redirect_url = add_preserved_filters(
                 {
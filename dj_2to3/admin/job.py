@@ -0,0 +1,114 @@
+"""The admin of the model of Job."""
+
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from django.contrib import admin, messages
+from django.db.models import Model
+from django.http import HttpRequest
+from django.urls import NoReverseMatch, reverse
+from django.utils.html import format_html
+from django.utils.translation import gettext as _
+
+from ..models import Job
+
+
+def enqueue_jobs(
+    model_admin: admin.ModelAdmin,  # type: ignore[type-arg]
+    request: HttpRequest,
+    action: str,
+    objs: Iterable[Model],
+    arguments: Optional[dict[str, Any]] = None,
+) -> list[Job]:
+    """Enqueue the jobs of the action on the objects, with a link to their status."""
+    jobs = Job.enqueue(action, objs, arguments)
+    url = reverse("admin:dj_2to3_job_changelist")
+    msg = format_html(
+        _(
+            'The {no_jobs} jobs "{action}" were queued, see <a href="{url}">{status}</a>.'
+        ),
+        no_jobs=len(jobs),
+        action=Job.Action(action).label,
+        url=f"{url}?id__in={','.join(str(job.pk) for job in jobs)}",
+        status=_("their status"),
+    )
+    model_admin.message_user(request, msg, messages.SUCCESS)
+    return jobs
+
+
+@admin.register(Job)
+class JobAdmin(
+    admin.ModelAdmin[Job]
+):  # pylint: disable=too-few-public-methods,unsubscriptable-object
+    """The admin of the model of Job."""
+
+    fieldsets = (
+        (
+            None,
+            {
+                "fields": (
+                    "action",
+                    "target_link",
+                    "arguments",
+                    "status",
+                    "worker",
+                    "result",
+                )
+            },
+        ),
+        ("Error", {"fields": ("error",)}),
+        (
+            "Time",
+            {"fields": ("created", "started", "heartbeat", "finished", "modified")},
+        ),
+    )
+    list_display = (
+        "id",
+        "action",
+        "target_link",
+        "status",
+        "worker",
+        "created",
+        "started",
+        "finished",
+    )
+    list_filter = ("status", "action")
+    list_select_related = ("content_type",)
+    readonly_fields = (
+        "action",
+        "target_link",
+        "arguments",
+        "status",
+        "worker",
+        "result",
+        "error",
+        "created",
+        "started",
+        "heartbeat",
+        "finished",
+        "modified",
+    )
+
+    @admin.display(description="Target")
+    def target_link(self, obj: Job) -> str:
+        """Return the link to the target of the job."""
+        try:
+            url = reverse(
+                f"admin:{obj.content_type.app_label}_{obj.content_type.model}_change",
+                args=[obj.object_id],
+            )
+        except NoReverseMatch:
+            return obj.object_id
+        return format_html('<a href="{}">{}</a>', url, obj.object_id)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Disable the add permission."""
+        return False
+
+    def has_change_permission(
+        self,
+        request: HttpRequest,
+        obj: Optional[Job] = None,  # pylint: disable=unused-argument
+    ) -> bool:
+        """Disable the change permission."""
+        return False
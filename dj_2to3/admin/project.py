@@ -1,21 +1,16 @@
 """The admin of the models about Project."""
 
-import html
 from typing import Optional
 
-from pygments import highlight
-from pygments.formatters import HtmlFormatter  # pylint: disable=no-name-in-module
-from pygments.lexers import DiffLexer  # pylint: disable=no-name-in-module
-
-from django.contrib import admin, messages
+from django.contrib import admin
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
-from django.db.models import QuerySet
+from django.db.models import Count, QuerySet, Sum
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.urls import reverse
 from django.utils.html import format_html
-from django.utils.translation import gettext as _
 
-from ..models import Project, ProjectFix
+from ..models import Job, Project, ProjectFix
+from .job import enqueue_jobs
 
 
 class ProjectFixInline(
@@ -23,9 +18,44 @@ class ProjectFixInline(
 ):  # pylint: disable=unsubscriptable-object
     """The inline for the project_fix model."""
 
-    fields = ["fix", "fix_docstring", "syntax_highlight_diff", "created", "modified"]
+    fields = [
+        "fix",
+        "fix_docstring",
+        "files",
+        "lines_added",
+        "lines_removed",
+        "project_fix_link",
+        "created",
+        "modified",
+    ]
     model = ProjectFix
-    readonly_fields = ["created", "modified", "fix_docstring", "syntax_highlight_diff"]
+    readonly_fields = [
+        "created",
+        "modified",
+        "fix_docstring",
+        "files",
+        "lines_added",
+        "lines_removed",
+        "project_fix_link",
+    ]
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ProjectFix]:
+        """
+        Annotate the numbers of the files and of the lines changed by the fixes.
+
+        The diffs are not loaded, they are shown on the pages of the project fixes.
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("fix")
+            .defer("diff")
+            .annotate(
+                files=Count("projectfixfile"),
+                lines_added=Sum("projectfixfile__lines_added", default=0),
+                lines_removed=Sum("projectfixfile__lines_removed", default=0),
+            )
+        )
 
     @admin.display()
     def fix_docstring(self, obj: ProjectFix) -> str:
@@ -33,15 +63,25 @@ class ProjectFixInline(
         return obj.fix.docstring
 
     @admin.display()
-    def syntax_highlight_diff(self, obj: ProjectFix) -> str:
-        """Return the syntax highlight diff."""
-        diff = highlight(
-            obj.diff,
-            DiffLexer(),
-            HtmlFormatter(nobackground=True, noclasses=True),
-        )
-        safe_diff = html.unescape(diff).replace("{", "{{").replace("}", "}}")
-        return format_html(safe_diff)
+    def files(self, obj: ProjectFix) -> int:
+        """Return the number of the files changed by the fix."""
+        return int(obj.files)  # type: ignore[attr-defined]
+
+    @admin.display()
+    def lines_added(self, obj: ProjectFix) -> int:
+        """Return the number of the lines added by the fix."""
+        return int(obj.lines_added)  # type: ignore[attr-defined]
+
+    @admin.display()
+    def lines_removed(self, obj: ProjectFix) -> int:
+        """Return the number of the lines removed by the fix."""
+        return int(obj.lines_removed)  # type: ignore[attr-defined]
+
+    @admin.display(description="Diff")
+    def project_fix_link(self, obj: ProjectFix) -> str:
+        """Return the link to the project fix, with its diff."""
+        url = reverse("admin:dj_2to3_projectfix_change", args=[obj.pk])
+        return format_html('<a href="{}">Show the diff</a>', url)
 
     def has_add_permission(
         self,
@@ -74,33 +114,72 @@ class ProjectAdmin(
 ):  # pylint: disable=too-few-public-methods,unsubscriptable-object
     """The admin of the models about Project."""
 
-    actions = ("analyze_future",)
+    actions = ("analyze_future", "refresh_fixes", "refresh_git")
     change_form_template = "dj_2to3/admin/change_form_project.html"
     fieldsets = (
-        (None, {"fields": ("path", "is_git_repository", "python_executable")}),
+        (
+            None,
+            {
+                "fields": (
+                    "path",
+                    "is_git_repository",
+                    "git_head",
+                    "python_executable",
+                    "analyzed_head",
+                )
+            },
+        ),
+        (
+            "Files",
+            {
+                "description": (
+                    "The files ignored by git are never analyzed in a git repository."
+                ),
+                "fields": ("include_patterns", "exclude_patterns"),
+            },
+        ),
         ("Time", {"fields": ("created", "modified")}),
     )
     inlines = (ProjectFixInline,)
     list_display = (
         "path",
         "is_git_repository",
+        "git_head",
         "python_executable__path",
         "python_executable__future__version",
         "modified",
     )
-    list_filter = ("python_executable__path",)
-    readonly_fields = ("is_git_repository", "created", "modified")
+    list_filter = ("python_executable__path", "git_repository")
+    list_select_related = ("python_executable__future",)
+    readonly_fields = (
+        "is_git_repository",
+        "git_head",
+        "analyzed_head",
+        "created",
+        "modified",
+    )
 
-    @admin.display(boolean=True, description="Is Git Repository")
+    @admin.display(
+        boolean=True, description="Is Git Repository", ordering="git_repository"
+    )
     def is_git_repository(self, obj: Project) -> bool:
-        """Return whether the project is a git repository."""
-        return obj.is_git_repository()
+        """Return whether the project is a git repository, as of the last refresh."""
+        return obj.git_repository
+
+    @admin.action(description="Refresh Git Status")
+    def refresh_git(self, request: HttpRequest, queryset: QuerySet[Project]) -> None:
+        """Enqueue the refreshes of the git status of the projects."""
+        enqueue_jobs(self, request, Job.Action.REFRESH_GIT, queryset)
 
     @admin.action(description="Analyze Future")
     def analyze_future(self, request: HttpRequest, queryset: QuerySet[Project]) -> None:
-        """Analyze the projects by future."""
-        for project in queryset:
-            project.analyze_future()
+        """Enqueue the analyses of the projects by future."""
+        enqueue_jobs(self, request, Job.Action.ANALYZE_FUTURE, queryset)
+
+    @admin.action(description="Refresh Fixes")
+    def refresh_fixes(self, request: HttpRequest, queryset: QuerySet[Project]) -> None:
+        """Enqueue the refreshes of all fixes of the projects."""
+        enqueue_jobs(self, request, Job.Action.REFRESH_FIXES, queryset)
 
     # def has_change_permission(
     #     self,
@@ -118,31 +197,8 @@ class ProjectAdmin(
             request, preserved_filters
         )
 
-        msg_dict = {
-            "obj_future": format_html(
-                '<a href="{}">{}</a>',
-                reverse(
-                    "admin:dj_2to3_future_change",
-                    args=[obj.python_executable.future.pk],
-                ),
-                obj.python_executable.future,
-            ),
-            "obj_project": format_html(
-                '<a href="{}">{}</a>',
-                reverse("admin:dj_2to3_project_change", args=[obj.pk]),
-                obj,
-            ),
-        }
         if "_future" in request.POST:
-            obj.analyze_future()
-            msg = format_html(
-                _(
-                    "The project {obj_project} was analyzed "
-                    'successfully by the future "{obj_future}".'
-                ),
-                **msg_dict,
-            )
-            self.message_user(request, msg, messages.SUCCESS)
+            enqueue_jobs(self, request, Job.Action.ANALYZE_FUTURE, [obj])
             redirect_url = request.path
             redirect_url = add_preserved_filters(
                 {
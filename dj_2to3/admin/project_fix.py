@@ -7,14 +7,26 @@ from pygments import highlight
 from pygments.formatters import HtmlFormatter  # pylint: disable=no-name-in-module
 from pygments.lexers import DiffLexer  # pylint: disable=no-name-in-module
 
-from django.contrib import admin, messages
+from django.contrib import admin
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
+from django.db.models import Count, QuerySet, Sum
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.urls import reverse
 from django.utils.html import format_html
-from django.utils.translation import gettext as _
 
-from ..models import ProjectFix
+from ..models import Job, Project, ProjectFix
+from .job import enqueue_jobs
+
+
+def highlight_diff(diff: str) -> str:
+    """Return the diff highlighted as HTML."""
+    highlighted = highlight(
+        diff,
+        DiffLexer(),
+        HtmlFormatter(nobackground=True, noclasses=True),
+    )
+    safe_diff = html.unescape(highlighted).replace("{", "{{").replace("}", "}}")
+    return format_html(safe_diff)
 
 
 @admin.register(ProjectFix)
@@ -23,16 +35,26 @@ class ProjectFixAdmin(
 ):  # pylint: disable=too-few-public-methods,unsubscriptable-object
     """The PythonExecutable admin."""
 
+    actions = ("apply_fixes", "refresh_fixes")
     change_form_template = "dj_2to3/admin/change_form_project_fix.html"
     fieldsets = (
         (
             None,
             {"fields": ("project", "fix", "fix_name", "fix_category", "fix_docstring")},
         ),
+        ("Files", {"fields": ("files_link", "lines_added", "lines_removed")}),
         ("Syntax Highlight Diff", {"fields": ("syntax_highlight_diff",)}),
         ("Time", {"fields": ("created", "modified")}),
     )
-    list_display = ("project", "fix__name", "created", "modified")
+    list_display = (
+        "project",
+        "fix__name",
+        "files",
+        "lines_added",
+        "lines_removed",
+        "created",
+        "modified",
+    )
     list_filter = ("project__path", "fix__category")
     readonly_fields = (
         "project",
@@ -41,10 +63,30 @@ class ProjectFixAdmin(
         "fix_name",
         "fix_category",
         "fix_docstring",
+        "files_link",
+        "lines_added",
+        "lines_removed",
         "created",
         "modified",
     )
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ProjectFix]:
+        """
+        Annotate the numbers of the files and of the lines changed by the fixes.
+
+        The diffs are loaded only when they are shown.
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .defer("diff")
+            .annotate(
+                files=Count("projectfixfile"),
+                lines_added=Sum("projectfixfile__lines_added", default=0),
+                lines_removed=Sum("projectfixfile__lines_removed", default=0),
+            )
+        )
+
     def has_add_permission(self, request: HttpRequest) -> bool:
         """Disable the add permission."""
         return False
@@ -57,16 +99,60 @@ class ProjectFixAdmin(
         """Disable the delete permission."""
         return False
 
+    @admin.action(description="Apply Fixes in One Pass")
+    def apply_fixes(self, request: HttpRequest, queryset: QuerySet[ProjectFix]) -> None:
+        """Enqueue the applications of the fixes in one pass per project."""
+        self.enqueue_by_project(request, Job.Action.APPLY_FIXES, queryset)
+
+    @admin.action(description="Refresh Fixes in One Pass")
+    def refresh_fixes(
+        self, request: HttpRequest, queryset: QuerySet[ProjectFix]
+    ) -> None:
+        """Enqueue the refreshes of the fixes in one pass per project."""
+        self.enqueue_by_project(request, Job.Action.REFRESH_FIXES, queryset)
+
+    def enqueue_by_project(
+        self, request: HttpRequest, action: str, queryset: QuerySet[ProjectFix]
+    ) -> None:
+        """Enqueue one job of the action per project, with the fixes of the project."""
+        fixes: dict[str, list[str]] = {}
+        for project, name in queryset.values_list("project", "fix__name"):
+            fixes.setdefault(project, []).append(name)
+        for project in Project.objects.filter(pk__in=fixes):
+            enqueue_jobs(
+                self, request, action, [project], {"fixes": sorted(fixes[project.pk])}
+            )
+
     @admin.display(description="Diff")
     def syntax_highlight_diff(self, obj: ProjectFix) -> str:
         """Return the syntax highlight diff."""
-        diff = highlight(
-            obj.diff,
-            DiffLexer(),
-            HtmlFormatter(nobackground=True, noclasses=True),
+        return highlight_diff(obj.diff)
+
+    @admin.display(ordering="files")
+    def files(self, obj: ProjectFix) -> int:
+        """Return the number of the files changed by the fix."""
+        return int(obj.files)  # type: ignore[attr-defined]
+
+    @admin.display(description="Files")
+    def files_link(self, obj: ProjectFix) -> str:
+        """Return the link to the files changed by the fix."""
+        url = reverse("admin:dj_2to3_projectfixfile_changelist")
+        return format_html(
+            '<a href="{}?project_fix__id__exact={}">{} files</a>',
+            url,
+            obj.pk,
+            obj.files,  # type: ignore[attr-defined]
         )
-        safe_diff = html.unescape(diff).replace("{", "{{").replace("}", "}}")
-        return format_html(safe_diff)
+
+    @admin.display(ordering="lines_added")
+    def lines_added(self, obj: ProjectFix) -> int:
+        """Return the number of the lines added by the fix."""
+        return int(obj.lines_added)  # type: ignore[attr-defined]
+
+    @admin.display(ordering="lines_removed")
+    def lines_removed(self, obj: ProjectFix) -> int:
+        """Return the number of the lines removed by the fix."""
+        return int(obj.lines_removed)  # type: ignore[attr-defined]
 
     @admin.display()
     def fix_name(self, obj: ProjectFix) -> str:
@@ -91,28 +177,8 @@ class ProjectFixAdmin(
             request, preserved_filters
         )
 
-        msg_dict = {
-            "obj_fix": format_html(
-                '<a href="{}">{}</a>',
-                reverse("admin:dj_2to3_fix_change", args=[obj.fix.pk]),
-                obj.fix,
-            ),
-            "obj_project": format_html(
-                '<a href="{}">{}</a>',
-                reverse("admin:dj_2to3_project_change", args=[obj.project.pk]),
-                obj.project,
-            ),
-        }
         if "_apply_this_fix" in request.POST:
-            obj.apply_fix()
-            msg = format_html(
-                _(
-                    'The fix "{obj_fix}" was applied successfully '
-                    'on the project "{obj_project}".'
-                ),
-                **msg_dict,
-            )
-            self.message_user(request, msg, messages.SUCCESS)
+            enqueue_jobs(self, request, Job.Action.APPLY_FIX, [obj])
             redirect_url = request.path
             redirect_url = add_preserved_filters(
                 {
@@ -125,19 +191,8 @@ class ProjectFixAdmin(
             return HttpResponseRedirect(redirect_url)
 
         if "_refresh_this_fix" in request.POST:
-            result = obj.refresh_fix()
-            msg = format_html(
-                _(
-                    'The fix "{obj_fix}" was refreshed successfully '
-                    'on the project "{obj_project}".'
-                ),
-                **msg_dict,
-            )
-            self.message_user(request, msg, messages.SUCCESS)
-            if result:
-                redirect_url = reverse("admin:dj_2to3_projectfix_changelist")
-            else:
-                redirect_url = request.path
+            enqueue_jobs(self, request, Job.Action.REFRESH_FIX, [obj])
+            redirect_url = request.path
             redirect_url = add_preserved_filters(
                 {
                     "preserved_filters": preserved_filters,
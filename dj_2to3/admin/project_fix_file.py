@@ -0,0 +1,92 @@
+"""The admin of the model of ProjectFixFile."""
+
+from typing import Optional
+
+from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from ..models import Job, ProjectFixFile
+from .job import enqueue_jobs
+from .project_fix import highlight_diff
+
+
+@admin.register(ProjectFixFile)
+class ProjectFixFileAdmin(
+    admin.ModelAdmin[ProjectFixFile]
+):  # pylint: disable=too-few-public-methods,unsubscriptable-object
+    """The admin of the model of ProjectFixFile."""
+
+    actions = ("apply_fix",)
+    fieldsets = (
+        (None, {"fields": ("project_fix", "path", "sha256")}),
+        ("Lines", {"fields": ("lines_added", "lines_removed", "hunk_count")}),
+        ("Syntax Highlight Diff", {"fields": ("syntax_highlight_diff",)}),
+        ("Time", {"fields": ("created", "modified")}),
+    )
+    list_display = (
+        "path",
+        "project_fix__fix__name",
+        "lines_added",
+        "lines_removed",
+        "hunk_count",
+        "modified",
+    )
+    list_filter = ("project_fix__project__path", "project_fix__fix__category")
+    list_select_related = ("project_fix__fix",)
+    readonly_fields = (
+        "project_fix",
+        "path",
+        "sha256",
+        "lines_added",
+        "lines_removed",
+        "hunk_count",
+        "syntax_highlight_diff",
+        "created",
+        "modified",
+    )
+    search_fields = ("path",)
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ProjectFixFile]:
+        """
+        Load the diff only when a file is shown.
+
+        The project fix is joined for the blob of its diff, out of which the diff of a
+        file is read, but its own diff is not loaded. The changelist does not join the
+        related objects of its own once they are joined here.
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .select_related(*self.list_select_related)
+            .defer("diff", "project_fix__diff")
+        )
+
+    @admin.action(description="Apply Fix")
+    def apply_fix(
+        self, request: HttpRequest, queryset: QuerySet[ProjectFixFile]
+    ) -> None:
+        """Enqueue the applications of the fixes to the files."""
+        enqueue_jobs(self, request, Job.Action.APPLY_FIX, queryset)
+
+    @admin.display(description="Hunks")
+    def hunk_count(self, obj: ProjectFixFile) -> int:
+        """Return the number of the hunks of the diff."""
+        return len(obj.hunks)
+
+    @admin.display(description="Diff")
+    def syntax_highlight_diff(self, obj: ProjectFixFile) -> str:
+        """Return the syntax highlight diff."""
+        return highlight_diff(obj.read_diff())
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Disable the add permission."""
+        return False
+
+    def has_change_permission(
+        self,
+        request: HttpRequest,
+        obj: Optional[ProjectFixFile] = None,  # pylint: disable=unused-argument
+    ) -> bool:
+        """Disable the change permission."""
+        return False
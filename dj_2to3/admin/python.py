@@ -1,19 +1,19 @@
 """The admin of the models about Python."""
 
-import subprocess  # nosec B404
-from typing import Optional
+from typing import Any, Optional
 
-from packaging.version import Version
-
-from django.contrib import admin, messages
+from django import forms
+from django.contrib import admin
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
-from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
-from django.urls import reverse
-from django.utils.html import format_html
-from django.utils.translation import gettext as _
+from django.core.exceptions import PermissionDenied
+from django.db.models import Field, QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.urls import URLPattern, path, reverse
 
-from ..models import Project, PythonExecutable
+from ..models import Job, Project, PythonCandidate, PythonExecutable
+from ..models.python import check_package_installed
+from .job import enqueue_jobs
+from .widgets import PathAutocompleteWidget
 
 
 class ProjectInline(
@@ -21,14 +21,14 @@ class ProjectInline(
 ):  # pylint: disable=unsubscriptable-object
     """The inline for the project model."""
 
-    fields = ["path", "is_git_repository", "created", "modified"]
+    fields = ["path", "is_git_repository", "git_head", "created", "modified"]
     model = Project
-    readonly_fields = ["is_git_repository", "created", "modified"]
+    readonly_fields = ["is_git_repository", "git_head", "created", "modified"]
 
     @admin.display(boolean=True)
     def is_git_repository(self, obj: Project) -> bool:
-        """Return whether the project is a git repository."""
-        return obj.is_git_repository()
+        """Return whether the project is a git repository, as of the last refresh."""
+        return obj.git_repository
 
     def has_add_permission(
         self,
@@ -107,81 +107,70 @@ class PythonExecutableAdmin(
         "pylint_installed",
     )
 
-    def check_package_installed(self, obj: PythonExecutable, package: str) -> bool:
-        """Check if the given package is installed."""
-        if obj.version < Version("3"):
-            command = [
-                obj.path,
-                "-c",
-                f"import imp; imp.find_module('{package}')",
-            ]
-            try:
-                _ = subprocess.run(  # nosec B603
-                    command, capture_output=True, check=True, text=True
-                )
-            except subprocess.CalledProcessError:
-                return False
-            return True
-
-        command = [
-            obj.path,
-            "-c",
-            "import importlib.util; "
-            f"print(importlib.util.find_spec('{package}') is not None)",
+    def get_urls(self) -> list[URLPattern]:
+        """Add the URL of the discovered Python executables."""
+        return [
+            path(
+                "discover/",
+                self.admin_site.admin_view(self.discover_view),
+                name="dj_2to3_pythonexecutable_discover",
+            ),
+            *super().get_urls(),
         ]
-        result = subprocess.run(  # nosec B603
-            command, capture_output=True, check=True, text=True
+
+    def discover_view(self, request: HttpRequest) -> JsonResponse:
+        """Return the unregistered Python candidates matching the term."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        paths = (
+            PythonCandidate.objects.filter(path__icontains=request.GET.get("term", ""))
+            .exclude(path__in=PythonExecutable.objects.values("path"))
+            .order_by("path")
+            .values_list("path", flat=True)[:20]
         )
-        return result.stdout.strip() == "True"
+        return JsonResponse({"results": [{"id": path, "text": path} for path in paths]})
+
+    def formfield_for_dbfield(
+        self, db_field: Field[Any, Any], request: HttpRequest, **kwargs: Any
+    ) -> Optional[forms.Field]:
+        """Complete the path from the Python candidates."""
+        if db_field.name == "path":
+            kwargs["widget"] = PathAutocompleteWidget(
+                reverse("admin:dj_2to3_pythonexecutable_discover")
+            )
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
 
     @admin.display(boolean=True)
     def modernize_installed(self, obj: PythonExecutable) -> bool:
         """Check if the modernize package is installed."""
-        return self.check_package_installed(obj, "modernize")
+        return check_package_installed(obj, "modernize")
 
     @admin.display(boolean=True)
     def six_installed(self, obj: PythonExecutable) -> bool:
         """Check if the six package is installed."""
-        return self.check_package_installed(obj, "six")
+        return check_package_installed(obj, "six")
 
     @admin.display(boolean=True)
     def bandit_installed(self, obj: PythonExecutable) -> bool:
         """Check if the six package is installed."""
-        return self.check_package_installed(obj, "bandit")
+        return check_package_installed(obj, "bandit")
 
     @admin.display(boolean=True)
     def radon_installed(self, obj: PythonExecutable) -> bool:
         """Check if the six package is installed."""
-        return self.check_package_installed(obj, "radon")
+        return check_package_installed(obj, "radon")
 
     @admin.display(boolean=True)
     def pylint_installed(self, obj: PythonExecutable) -> bool:
         """Check if the six package is installed."""
-        return self.check_package_installed(obj, "pylint")
-
-    def _install_dependencies(self, python_executable: PythonExecutable) -> None:
-        """Install dependencies."""
-        command = [
-            python_executable.path,
-            "-m",
-            "pip",
-            "install",
-            "--upgrade",
-            "future",
-            "modernize",
-            "six",
-        ]
-        subprocess.run(  # nosec B603
-            command, capture_output=True, check=True, text=True
-        )
+        return check_package_installed(obj, "pylint")
 
     @admin.action(description="Install dependencies")
     def install_dependencies(
         self, request: HttpRequest, queryset: QuerySet[PythonExecutable]
     ) -> None:
-        """Install dependencies."""
-        for python_executable in queryset:
-            self._install_dependencies(python_executable)
+        """Enqueue the installations of the dependencies."""
+        enqueue_jobs(self, request, Job.Action.INSTALL_DEPENDENCIES, queryset)
 
     def response_change(
         self, request: HttpRequest, obj: PythonExecutable
@@ -193,23 +182,8 @@ class PythonExecutableAdmin(
             request, preserved_filters
         )
 
-        msg_dict = {
-            "obj_python_executable": format_html(
-                '<a href="{}">{}</a>',
-                reverse("admin:dj_2to3_pythonexecutable_change", args=[obj.pk]),
-                obj,
-            ),
-        }
         if "_install_dependencies" in request.POST:
-            self._install_dependencies(obj)
-            msg = format_html(
-                _(
-                    "The dependencies was installed successfully to "
-                    'the python executable "{obj_python_executable}".'
-                ),
-                **msg_dict,
-            )
-            self.message_user(request, msg, messages.SUCCESS)
+            enqueue_jobs(self, request, Job.Action.INSTALL_DEPENDENCIES, [obj])
             redirect_url = request.path
             redirect_url = add_preserved_filters(
                 {
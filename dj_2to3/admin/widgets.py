@@ -0,0 +1,31 @@
+"""The widgets of the admins in this application."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django import forms
+
+
+class PathAutocompleteWidget(forms.TextInput):
+    """The text input completing the path from the results of the given URL."""
+
+    template_name = "dj_2to3/widgets/path_autocomplete.html"
+
+    class Media:
+        """The Media class for PathAutocompleteWidget."""
+
+        js = ("dj_2to3/js/path_autocomplete.js",)
+
+    def __init__(self, url: str, attrs: dict[str, Any] | None = None) -> None:
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(
+        self, name: str, value: Any, attrs: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["list"] = f"{context['widget']['attrs']['id']}_list"
+        context["widget"]["attrs"]["data-autocomplete-url"] = str(self.url)
+        context["widget"]["attrs"]["autocomplete"] = "off"
+        return context
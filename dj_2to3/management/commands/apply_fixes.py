@@ -0,0 +1,43 @@
+"""The command to apply many fixes to a project in one pass."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...models import Project
+
+
+class Command(BaseCommand):
+    """Apply the fixes to the project in one pass of futurize per stage."""
+
+    help = (
+        "Apply the fixes to the project in one pass of futurize per stage, the fixes "
+        "of the stage 1 first, and refresh all fixes of the project in bulk."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("project", help="The path of the project.")
+        parser.add_argument(
+            "--fix",
+            action="append",
+            dest="fixes",
+            help="The name of a fix to apply, all fixes with a diff by default.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            project = Project.objects.get(path=options["project"])
+        except Project.DoesNotExist as exc:
+            raise CommandError(f"Unknown project: {options['project']}.") from exc
+        if not project.python_executable:
+            raise CommandError(f"No Python executable of the project: {project.path}.")
+        fixes = options["fixes"] or project.projectfix_set.values_list(
+            "fix__name", flat=True
+        )
+        applied = project.apply_fixes(fixes)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(applied)} files were applied, {project.projectfix_set.count()} "
+                "fixes are left."
+            )
+        )
@@ -0,0 +1,37 @@
+"""The command to discover the Python executables."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...models import PythonCandidate
+
+
+class Command(BaseCommand):
+    """Discover the Python executables and update the candidates."""
+
+    help = (
+        "Discover the Python executables under the roots and update the candidates "
+        "completed in the admin. Only the directories changed since the last scan are "
+        "listed again, unless --full is given."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "roots",
+            nargs="*",
+            help="The directories to scan, DJ_2TO3_DISCOVERY_ROOTS by default.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="List every directory again instead of the changed ones only.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        added, removed = PythonCandidate.rescan(options["roots"], options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{added} Python candidates were added and {removed} were removed."
+            )
+        )
@@ -0,0 +1,41 @@
+"""The command to inspect the cache of the diffs of the files."""
+
+import shutil
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...utils.cache import evict, get_fragments_dir, update_stats
+
+
+class Command(BaseCommand):
+    """Show the counters and the size of the cache of the diffs of the files."""
+
+    help = (
+        "Show the hit and miss counters and the size of the cache of the diffs of the "
+        "files, evicting the least recently used entries above the maximum size."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Remove all entries and counters of the cache.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["clear"]:
+            shutil.rmtree(get_fragments_dir(), ignore_errors=True)
+            self.stdout.write(self.style.SUCCESS("The cache was cleared."))
+            return
+        stats = update_stats()
+        evicted, size = evict(settings.DJ_2TO3_FRAGMENT_CACHE_SIZE)
+        total = stats["hits"] + stats["misses"]
+        self.stdout.write(
+            f"Hits: {stats['hits']}\n"
+            f"Misses: {stats['misses']}\n"
+            f"Hit ratio: {stats['hits'] / total if total else 0:.2%}\n"
+            f"Size: {size} / {settings.DJ_2TO3_FRAGMENT_CACHE_SIZE} bytes\n"
+            f"Evicted: {evicted}"
+        )
@@ -0,0 +1,42 @@
+"""The command to delete the blobs not referenced any more."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...models import ProjectFix
+from ...utils import collect_blobs
+
+
+class Command(BaseCommand):
+    """Delete the blobs of the blob store not referenced by any project fix."""
+
+    help = (
+        "Delete the blobs of the blob store not referenced by any project fix, except "
+        "the ones younger than the grace period."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--grace",
+            type=float,
+            default=3600,
+            help="The age in seconds under which a blob is kept, 3600 by default.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show the number and the size of the blobs to delete.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        referenced = ProjectFix.objects.exclude(diff_blob="").values_list(
+            "diff_blob", flat=True
+        )
+        deleted, size = collect_blobs(
+            referenced.iterator(), options["grace"], options["dry_run"]
+        )
+        verb = "would be deleted" if options["dry_run"] else "were deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} blobs of {size} bytes {verb}.")
+        )
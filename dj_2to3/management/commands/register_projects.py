@@ -0,0 +1,60 @@
+"""The command to register the projects in bulk."""
+
+import os
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...models import Project, PythonExecutable
+
+
+class Command(BaseCommand):
+    """Register every directory under the root as a project."""
+
+    help = (
+        "Register every directory under the root as a project, with its git status "
+        "detected concurrently, in bulk."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "root",
+            nargs="?",
+            default=Project._meta.get_field("path").path,
+            help="The directory of the projects, the path of Project.path by default.",
+        )
+        parser.add_argument(
+            "--python-executable",
+            help="The path of the Python executable of the projects.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="The number of concurrent detections, DJ_2TO3_WORKERS by default.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        python_executable = None
+        if path := options["python_executable"]:
+            try:
+                python_executable = PythonExecutable.objects.get(path=path)
+            except PythonExecutable.DoesNotExist as exc:
+                raise CommandError(f"Unknown Python executable: {path}.") from exc
+        try:
+            paths = [
+                entry.path
+                for entry in os.scandir(options["root"])
+                if entry.is_dir() and not entry.name.startswith(".")
+            ]
+        except OSError as exc:
+            raise CommandError(f"Cannot list the root: {exc}.") from exc
+        projects = Project.register_many(
+            paths, python_executable, workers=options["workers"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(projects)} projects were registered, "
+                f"{sum(project.git_repository for project in projects)} of them are "
+                "git repositories."
+            )
+        )
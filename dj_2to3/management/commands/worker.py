@@ -0,0 +1,62 @@
+"""The command to run the queued jobs in the background."""
+
+import os
+import signal
+import socket
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from ...models import Job
+
+
+class Command(BaseCommand):
+    """Run the queued jobs until stopped."""
+
+    help = (
+        "Run the jobs queued by the admin actions, one at a time. Many workers can be "
+        "run on many nodes to drain the queue concurrently."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit when the queue is empty instead of waiting for new jobs.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="The seconds to wait before polling an empty queue again.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        stopping = False
+
+        def stop(signum: int, frame: Any) -> None:  # pylint: disable=unused-argument
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.stdout.write(f"Worker {name} started.")
+        while not stopping:
+            close_old_connections()
+            if not (job := Job.claim(name)):
+                if options["burst"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+            self.stdout.write(f"Running job {job.pk}: {job}")
+            job.run()
+            style = (
+                self.style.SUCCESS
+                if job.status == Job.Status.SUCCEEDED
+                else self.style.ERROR
+            )
+            self.stdout.write(style(f"Job {job.pk} {job.get_status_display()}."))
+        self.stdout.write(f"Worker {name} stopped.")
@@ -0,0 +1,190 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:29
+
+import dj_2to3.models.python
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0010_future"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Project",
+            fields=[
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "path",
+                    models.FilePathField(
+                        allow_files=False,
+                        allow_folders=True,
+                        path="/root/projects",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+            ],
+            options={
+                "get_latest_by": "modified",
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="Fix",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("docstring", models.TextField()),
+                ("category", models.CharField(max_length=255)),
+                (
+                    "future",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="dj_2to3.future"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Fixes",
+            },
+        ),
+        migrations.CreateModel(
+            name="ProjectFix",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                ("diff", models.TextField()),
+                (
+                    "fix",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="dj_2to3.fix"
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="dj_2to3.project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Project Fixes",
+            },
+        ),
+        migrations.CreateModel(
+            name="PythonExecutable",
+            fields=[
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "path",
+                    models.FilePathField(
+                        match="^python([23]\\.[0-9]{,2}){,1}$",
+                        path="/root",
+                        primary_key=True,
+                        recursive=True,
+                        serialize=False,
+                        validators=[dj_2to3.models.python.validate_python_executable],
+                    ),
+                ),
+                (
+                    "future",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="dj_2to3.future",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Python Executable",
+            },
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="python_executable",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="dj_2to3.pythonexecutable",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="fix",
+            constraint=models.UniqueConstraint(
+                fields=("name", "future"), name="unique_fix"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="projectfix",
+            constraint=models.UniqueConstraint(
+                fields=("project", "fix"), name="unique_project_fix"
+            ),
+        ),
+    ]
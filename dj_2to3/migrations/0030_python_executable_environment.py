@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0020_python_executable_project_fix"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pythonexecutable",
+            name="environment_signature",
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pythonexecutable",
+            name="environment_snapshot",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:30
+
+import dj_2to3.models.python
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0030_python_executable_environment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PythonCandidate",
+            fields=[
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+            ],
+            options={
+                "verbose_name": "Python Candidate",
+            },
+        ),
+        migrations.AlterField(
+            model_name="pythonexecutable",
+            name="path",
+            field=models.CharField(
+                help_text="The candidates are found by the command discover_pythons.",
+                max_length=255,
+                primary_key=True,
+                serialize=False,
+                validators=[dj_2to3.models.python.validate_python_executable],
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0040_python_candidate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="git_head",
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="git_repository",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
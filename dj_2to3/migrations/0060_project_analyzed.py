@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0050_project_git"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="analyzed_head",
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="analyzed_state",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,172 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:02
+
+import re
+
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.db import migrations, models
+
+# The diffs are split and indexed by the frozen copies of the functions of
+# dj_2to3.utils.diff at the time of this migration, which must not change with them
+HUNK_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def parse_hunk_header(match: re.Match[str]) -> list[int]:
+    """Get the start and the number of the old lines and the new lines of a hunk."""
+    old_start, old_count, new_start, new_count = match.groups()
+    return [
+        int(old_start),
+        int(1 if old_count is None else old_count),
+        int(new_start),
+        int(1 if new_count is None else new_count),
+    ]
+
+
+def split_diff(diff: str) -> dict[str, str]:
+    """Split the diff of a project into the diffs of its files."""
+    fragments: dict[str, list[str]] = {}
+    lines = diff.splitlines(keepends=True)
+    path = ""
+    old = new = 0
+    for i, line in enumerate(lines):
+        if old > 0 or new > 0:
+            if line.startswith((" ", "-")):
+                old -= 1
+            if line.startswith((" ", "+")):
+                new -= 1
+        elif (
+            line.startswith("--- ")
+            and i + 1 < len(lines)
+            and lines[i + 1].startswith("+++ ")
+        ):
+            path = line[4:].rstrip("\n").rsplit("\t", 1)[0]
+        elif match := HUNK_PATTERN.match(line):
+            _, old, _, new = parse_hunk_header(match)
+        fragments.setdefault(path, []).append(line)
+    return {path: "".join(fragment) for path, fragment in fragments.items()}
+
+
+def index_diff(fragment: str) -> tuple[int, int, list[list[int]]]:
+    """Count the added and the removed lines of the diff of a file, and index its hunks."""
+    added = removed = offset = old = new = 0
+    hunks: list[list[int]] = []
+    for line in fragment.splitlines(keepends=True):
+        if old > 0 or new > 0:
+            if line.startswith(("-", " ")):
+                old -= 1
+            if line.startswith(("+", " ")):
+                new -= 1
+            added += line.startswith("+")
+            removed += line.startswith("-")
+        elif match := HUNK_PATTERN.match(line):
+            hunk = parse_hunk_header(match)
+            _, old, _, new = hunk
+            hunks.append([offset, *hunk])
+        offset += len(line)
+    return added, removed, hunks
+
+
+def split_project_fixes(apps, schema_editor):
+    """
+    Split the diffs of the existing project fixes into their files.
+
+    The files are not hashed, because they may be changed since they were analyzed.
+    """
+    ProjectFix = apps.get_model("dj_2to3", "ProjectFix")
+    ProjectFixFile = apps.get_model("dj_2to3", "ProjectFixFile")
+    for project_fix in ProjectFix.objects.iterator(chunk_size=100):
+        files = []
+        offset = 0
+        for path, diff in split_diff(project_fix.diff).items():
+            lines_added, lines_removed, hunks = index_diff(diff)
+            files.append(
+                ProjectFixFile(
+                    project_fix=project_fix,
+                    path=path,
+                    diff=diff,
+                    offset=offset,
+                    lines_added=lines_added,
+                    lines_removed=lines_removed,
+                    hunks=hunks,
+                )
+            )
+            offset += len(diff)
+        ProjectFixFile.objects.bulk_create(files, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0080_job_progress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectFixFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                ("path", models.CharField(max_length=1024)),
+                ("diff", models.TextField()),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(
+                        help_text="The offset in characters of the diff in the one of the project fix."
+                    ),
+                ),
+                ("lines_added", models.PositiveIntegerField(default=0)),
+                ("lines_removed", models.PositiveIntegerField(default=0)),
+                (
+                    "hunks",
+                    models.JSONField(
+                        default=list,
+                        help_text="The offset in the diff, the old start, the old count, the new start and the new count of every hunk.",
+                    ),
+                ),
+                (
+                    "sha256",
+                    models.CharField(
+                        blank=True,
+                        help_text="The sha256 of the content of the file when the diff is saved.",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "project_fix",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="dj_2to3.projectfix",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Project Fix File",
+                "ordering": ["project_fix", "offset"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project_fix", "path"), name="unique_project_fix_file"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(split_project_fixes, migrations.RunPython.noop),
+    ]
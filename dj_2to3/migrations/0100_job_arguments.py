@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0090_project_fix_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="arguments",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("analyze_future", "Analyze Future"),
+                    ("load_fixes", "Load Fixes"),
+                    ("install_dependencies", "Install Dependencies"),
+                    ("apply_fix", "Apply Fix"),
+                    ("apply_fixes", "Apply Fixes"),
+                    ("refresh_fix", "Refresh Fix"),
+                ],
+                max_length=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0100_job_arguments"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="job",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("analyze_future", "Analyze Future"),
+                    ("load_fixes", "Load Fixes"),
+                    ("install_dependencies", "Install Dependencies"),
+                    ("apply_fix", "Apply Fix"),
+                    ("apply_fixes", "Apply Fixes"),
+                    ("refresh_fix", "Refresh Fix"),
+                    ("refresh_fixes", "Refresh Fixes"),
+                ],
+                max_length=32,
+            ),
+        ),
+    ]
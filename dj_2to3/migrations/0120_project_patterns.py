@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0110_job_refresh_fixes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="exclude_patterns",
+            field=models.TextField(
+                blank=True,
+                help_text="The globs of the files not to analyze, one per line, e.g. */migrations/* or vendor/*.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="include_patterns",
+            field=models.TextField(
+                blank=True,
+                help_text="The globs of the files to analyze, one per line, e.g. src/*.py, all files if empty. They are matched against the paths relative to the project.",
+            ),
+        ),
+    ]
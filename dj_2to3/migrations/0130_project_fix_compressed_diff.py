@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:36
+
+from django.db import migrations, models
+
+import dj_2to3.models.fields
+
+BATCH_SIZE = 500
+
+
+def compress_diffs(apps, schema_editor):
+    """Compress the diffs of the existing project fixes."""
+    ProjectFix = apps.get_model("dj_2to3", "ProjectFix")
+    batch = []
+    for project_fix in ProjectFix.objects.only("diff").iterator(chunk_size=BATCH_SIZE):
+        project_fix.compressed_diff = project_fix.diff
+        batch.append(project_fix)
+        if len(batch) >= BATCH_SIZE:
+            ProjectFix.objects.bulk_update(batch, ["compressed_diff"])
+            batch = []
+    ProjectFix.objects.bulk_update(batch, ["compressed_diff"])
+
+
+def decompress_diffs(apps, schema_editor):
+    """Decompress the diffs of the existing project fixes."""
+    ProjectFix = apps.get_model("dj_2to3", "ProjectFix")
+    batch = []
+    for project_fix in ProjectFix.objects.only("compressed_diff").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        project_fix.diff = project_fix.compressed_diff
+        batch.append(project_fix)
+        if len(batch) >= BATCH_SIZE:
+            ProjectFix.objects.bulk_update(batch, ["diff"])
+            batch = []
+    ProjectFix.objects.bulk_update(batch, ["diff"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0120_project_patterns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectfix",
+            name="compressed_diff",
+            field=dj_2to3.models.fields.CompressedTextField(default=b""),
+            preserve_default=False,
+        ),
+        # The blank text is the default of the diffs added back when it is reversed
+        migrations.AlterField(
+            model_name="projectfix",
+            name="diff",
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(compress_diffs, decompress_diffs),
+        migrations.RemoveField(
+            model_name="projectfix",
+            name="diff",
+        ),
+        migrations.RenameField(
+            model_name="projectfix",
+            old_name="compressed_diff",
+            new_name="diff",
+        ),
+    ]
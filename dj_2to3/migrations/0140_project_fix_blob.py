@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+import dj_2to3.models.fields
+
+BATCH_SIZE = 1000
+
+
+def measure_project_fix_files(apps, schema_editor):
+    """Set the sizes and the offsets in bytes of the diffs of the existing files."""
+    ProjectFixFile = apps.get_model("dj_2to3", "ProjectFixFile")
+    batch = []
+    project_fix_id = None
+    blob_offset = 0
+    for file in (
+        ProjectFixFile.objects.order_by("project_fix", "offset")
+        .only("project_fix", "diff")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        if file.project_fix_id != project_fix_id:
+            project_fix_id, blob_offset = file.project_fix_id, 0
+        file.size = len(file.diff.encode())
+        file.blob_offset = blob_offset
+        blob_offset += file.size
+        batch.append(file)
+        if len(batch) >= BATCH_SIZE:
+            ProjectFixFile.objects.bulk_update(batch, ["size", "blob_offset"])
+            batch = []
+    ProjectFixFile.objects.bulk_update(batch, ["size", "blob_offset"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0130_project_fix_compressed_diff"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectfix",
+            name="diff_blob",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="The sha256 of the diff in the blob store, if it is too big.",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectfixfile",
+            name="blob_offset",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                help_text="The offset in bytes of the diff in the one of the project fix.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectfixfile",
+            name="size",
+            field=models.PositiveBigIntegerField(
+                default=0, help_text="The size in bytes of the diff."
+            ),
+        ),
+        migrations.AlterField(
+            model_name="projectfix",
+            name="diff",
+            field=dj_2to3.models.fields.CompressedTextField(blob_field="diff_blob"),
+        ),
+        migrations.RunPython(measure_project_fix_files, migrations.RunPython.noop),
+    ]
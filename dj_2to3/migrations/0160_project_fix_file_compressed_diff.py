@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+import dj_2to3.models.fields
+
+BATCH_SIZE = 500
+
+
+def compress_diffs(apps, schema_editor):
+    """Compress the diffs of the existing project fix files."""
+    ProjectFixFile = apps.get_model("dj_2to3", "ProjectFixFile")
+    batch = []
+    for project_fix_file in ProjectFixFile.objects.only("diff").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        project_fix_file.compressed_diff = project_fix_file.diff
+        batch.append(project_fix_file)
+        if len(batch) >= BATCH_SIZE:
+            ProjectFixFile.objects.bulk_update(batch, ["compressed_diff"])
+            batch = []
+    ProjectFixFile.objects.bulk_update(batch, ["compressed_diff"])
+
+
+def decompress_diffs(apps, schema_editor):
+    """Decompress the diffs of the existing project fix files."""
+    ProjectFixFile = apps.get_model("dj_2to3", "ProjectFixFile")
+    batch = []
+    for project_fix_file in ProjectFixFile.objects.only("compressed_diff").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        project_fix_file.diff = project_fix_file.compressed_diff
+        batch.append(project_fix_file)
+        if len(batch) >= BATCH_SIZE:
+            ProjectFixFile.objects.bulk_update(batch, ["diff"])
+            batch = []
+    ProjectFixFile.objects.bulk_update(batch, ["diff"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0150_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectfixfile",
+            name="compressed_diff",
+            field=dj_2to3.models.fields.CompressedTextField(default=b""),
+            preserve_default=False,
+        ),
+        # The blank text is the default of the diffs added back when it is reversed
+        migrations.AlterField(
+            model_name="projectfixfile",
+            name="diff",
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(compress_diffs, decompress_diffs),
+        migrations.RemoveField(
+            model_name="projectfixfile",
+            name="diff",
+        ),
+        migrations.RenameField(
+            model_name="projectfixfile",
+            old_name="compressed_diff",
+            new_name="diff",
+        ),
+    ]
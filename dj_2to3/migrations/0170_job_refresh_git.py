@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dj_2to3", "0160_project_fix_file_compressed_diff"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="job",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("analyze_future", "Analyze Future"),
+                    ("load_fixes", "Load Fixes"),
+                    ("install_dependencies", "Install Dependencies"),
+                    ("apply_fix", "Apply Fix"),
+                    ("apply_fixes", "Apply Fixes"),
+                    ("refresh_fix", "Refresh Fix"),
+                    ("refresh_fixes", "Refresh Fixes"),
+                    ("refresh_git", "Refresh Git Status"),
+                ],
+                max_length=32,
+            ),
+        ),
+    ]
@@ -2,16 +2,22 @@
 
 from .fix import Fix
 from .future import Future
+from .job import Job
 from .project import Project
 from .project_fix import ProjectFix
+from .project_fix_file import ProjectFixFile
 from .python import PythonExecutable
+from .python_candidate import PythonCandidate
 from .user import User
 
 __all__ = [
     "Fix",
     "Future",
+    "Job",
     "Project",
     "ProjectFix",
+    "ProjectFixFile",
+    "PythonCandidate",
     "PythonExecutable",
     "User",
 ]
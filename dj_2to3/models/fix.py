@@ -7,6 +7,11 @@ from django_stubs_ext.db.models import TypedModelMeta
 from .future import Future
 
 
+def get_stage(category: str) -> int:
+    """Get the stage of ``futurize`` of the category of the fixes, 1 or 2."""
+    return 2 if category.endswith("stage2") else 1
+
+
 class Fix(TimeStampedModel, models.Model):  # type: ignore[misc]
     """The fix model."""
 
@@ -21,6 +26,11 @@ class Fix(TimeStampedModel, models.Model):  # type: ignore[misc]
         ]
         verbose_name_plural = "Fixes"
 
+    @property
+    def stage(self) -> int:
+        """Get the stage of ``futurize`` of the fix, 1 or 2."""
+        return get_stage(self.category)
+
     def __str__(self) -> str:
         return "{} object ({}, Future {})".format(  # pylint: disable=consider-using-f-string
             self.__class__.__name__,
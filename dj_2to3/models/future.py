@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
-import json
-import subprocess  # nosec B404
+from collections.abc import Iterable
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
 
 from django.db import models
 from django_extensions.db.models import TimeStampedModel
 from versionfield import VersionField
 
+from ..utils import read_catalog, write_catalog
+
 if TYPE_CHECKING:
     from .fix import Fix
     from .python import PythonExecutable
 
+CATEGORIES = [
+    "lib2to3_fix_names_stage1",
+    "libfuturize_fix_names_stage1",
+    "lib2to3_fix_names_stage2",
+    "libfuturize_fix_names_stage2",
+]
+
 
 class Future(TimeStampedModel, models.Model):  # type: ignore[misc]
     """The future model."""
@@ -22,52 +32,58 @@ class Future(TimeStampedModel, models.Model):  # type: ignore[misc]
     version = VersionField(primary_key=True)
 
     def load_fixes(self) -> list[Fix] | None:
-        """Get the fixes."""
-        if not (python_executable := self.pythonexecutable_set.first()):
-            return None
+        """
+        Get the fixes.
 
-        from .fix import Fix  # pylint: disable=import-outside-toplevel
+        The catalog of the fixes is read from the cache of this future version. On a
+        miss, all categories, names and docstrings are listed by one call of the Python
+        executable and cached. The fixes are written back with one upsert on the unique
+        fix constraint.
+        """
+        if (catalog := read_catalog(str(self.version))) is None:
+            if not (python_executable := self.pythonexecutable_set.first()):
+                return None
+            catalog = self.write_catalog(
+                python_executable.run_script("catalog", {"categories": CATEGORIES})
+            )
+        return self.upsert_fixes(catalog)
 
-        categories = [
-            "lib2to3_fix_names_stage1",
-            "libfuturize_fix_names_stage1",
-            "lib2to3_fix_names_stage2",
-            "libfuturize_fix_names_stage2",
+    async def aload_fixes(self) -> list[Fix] | None:
+        """The asynchronous variant of load_fixes."""
+        if (catalog := read_catalog(str(self.version))) is None:
+            if not (python_executable := await self.pythonexecutable_set.afirst()):
+                return None
+            catalog = self.write_catalog(
+                await python_executable.arun_script(
+                    "catalog", {"categories": CATEGORIES}
+                )
+            )
+        return await sync_to_async(self.upsert_fixes)(catalog)
+
+    def write_catalog(self, events: Iterable[dict[str, Any]]) -> list[dict[str, str]]:
+        """Write the catalog of the fixes listed by the script catalog to the cache."""
+        catalog = [
+            {
+                "category": event["category"],
+                "name": event["name"],
+                "docstring": event["docstring"],
+            }
+            for event in events
+            if event["type"] == "fix"
         ]
+        write_catalog(str(self.version), catalog)
+        return catalog
 
-        fixes: list[Fix] = []
-        for category in categories:
-            result = subprocess.run(  # nosec B603
-                [
-                    python_executable.path,
-                    "-c",
-                    "import json; "
-                    "from libfuturize import fixes; "
-                    f"print(json.dumps(list(fixes.{category})))",
-                ],
-                capture_output=True,
-                check=True,
-                text=True,
-            )
-            for fix in json.loads(result.stdout.strip()):
-                result_ = subprocess.run(  # nosec B603
-                    [
-                        python_executable.path,
-                        "-c",
-                        f"import {fix}; print({fix}.__doc__)",
-                    ],
-                    capture_output=True,
-                    check=True,
-                    text=True,
-                )
-                fix, _ = Fix.objects.update_or_create(
-                    name=fix,
-                    docstring=result_.stdout.strip(),
-                    category=category,
-                    future=self,
-                )
-                fixes.append(fix)
-        return fixes
+    def upsert_fixes(self, catalog: list[dict[str, str]]) -> list[Fix]:
+        """Insert or update the fixes of the catalog in one statement."""
+        from .fix import Fix  # pylint: disable=import-outside-toplevel
+
+        return Fix.objects.bulk_create(
+            [Fix(future=self, **fix) for fix in catalog],
+            update_conflicts=True,
+            unique_fields=["name", "future"],
+            update_fields=["docstring", "category", "modified"],
+        )
 
     def get_command_path(self, python_executable: PythonExecutable) -> Path:
         """Get the command path."""
@@ -0,0 +1,272 @@
+"""The job model in this application."""
+
+from __future__ import annotations
+
+import fcntl
+import threading
+import traceback
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+from django_stubs_ext.db.models import TypedModelMeta
+
+from ..utils import Progress
+
+
+@contextmanager
+def lock_queue() -> Iterator[None]:
+    """
+    Lock the queue of the jobs exclusively between the processes of this node.
+
+    It is the fallback of the databases without ``SELECT ... FOR UPDATE SKIP LOCKED``,
+    e.g. SQLite, which is not shared between nodes anyway.
+    """
+    path = Path(settings.DJ_2TO3_CACHE_DIR) / "jobs.lock"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+class Job(TimeStampedModel, models.Model):  # type: ignore[misc]
+    """The job of an action on an object, run in the background by the workers."""
+
+    class Action(models.TextChoices):
+        """The actions, named after the methods called on the objects."""
+
+        ANALYZE_FUTURE = "analyze_future", "Analyze Future"
+        LOAD_FIXES = "load_fixes", "Load Fixes"
+        INSTALL_DEPENDENCIES = "install_dependencies", "Install Dependencies"
+        APPLY_FIX = "apply_fix", "Apply Fix"
+        APPLY_FIXES = "apply_fixes", "Apply Fixes"
+        REFRESH_FIX = "refresh_fix", "Refresh Fix"
+        REFRESH_FIXES = "refresh_fixes", "Refresh Fixes"
+        REFRESH_GIT = "refresh_git", "Refresh Git Status"
+
+    class Status(models.TextChoices):
+        """The statuses of a job."""
+
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    action = models.CharField(max_length=32, choices=Action.choices)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=255)
+    target = GenericForeignKey("content_type", "object_id")
+    arguments = models.JSONField(default=dict, editable=False)
+
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    worker = models.CharField(max_length=255, blank=True)
+    started = models.DateTimeField(blank=True, null=True)
+    heartbeat = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+    result = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    progress = models.JSONField(default=dict, editable=False)
+
+    class Meta(TypedModelMeta):
+        """The Meta class for Job."""
+
+        ordering = ["-created"]
+        indexes = [models.Index(fields=["status", "created"])]
+
+    def __str__(self) -> str:
+        return f"{self.get_action_display()}: {self.object_id}"
+
+    @classmethod
+    def enqueue(
+        cls,
+        action: str,
+        objs: Iterable[models.Model],
+        arguments: dict[str, Any] | None = None,
+    ) -> list[Job]:
+        """
+        Enqueue the jobs of the action on the objects in one statement.
+
+        The arguments are passed to the action. The objects with a pending or running
+        job of the action with the same arguments already are not queued again, and
+        their active jobs are returned instead. The stale jobs are not active, their
+        workers are gone.
+        """
+        arguments = arguments or {}
+        jobs = [
+            cls(
+                action=action,
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=str(obj.pk),
+                arguments=arguments,
+            )
+            for obj in objs
+        ]
+        active = {
+            (job.content_type_id, job.object_id): job
+            for job in cls.objects.filter(
+                action=action,
+                object_id__in=[job.object_id for job in jobs],
+                status__in=[cls.Status.PENDING, cls.Status.RUNNING],
+            ).exclude(cls.get_stale_filter())
+            if job.arguments == arguments
+        }
+        Job.objects.bulk_create(
+            job for job in jobs if (job.content_type_id, job.object_id) not in active
+        )
+        return [active.get((job.content_type_id, job.object_id), job) for job in jobs]
+
+    @staticmethod
+    def get_stale_filter() -> models.Q:
+        """
+        Get the filter of the stale jobs.
+
+        They are the running jobs without a heartbeat for longer than the setting
+        DJ_2TO3_JOB_TIMEOUT, whose workers are gone, e.g. killed or crashed.
+        """
+        deadline = timezone.now() - timedelta(seconds=settings.DJ_2TO3_JOB_TIMEOUT)
+        return models.Q(status=Job.Status.RUNNING) & (
+            models.Q(heartbeat__lt=deadline)
+            | models.Q(heartbeat__isnull=True, started__lt=deadline)
+        )
+
+    @classmethod
+    def fail_stale(cls) -> int:
+        """Fail the stale jobs, and return the number of them."""
+        now = timezone.now()
+        return cls.objects.filter(cls.get_stale_filter()).update(
+            status=cls.Status.FAILED,
+            error="The worker stopped sending the heartbeats of the job.",
+            finished=now,
+            modified=now,
+        )
+
+    @classmethod
+    def claim(cls, worker: str) -> Job | None:
+        """
+        Claim the oldest pending job for the worker, after failing the stale jobs.
+
+        The pending jobs are locked by ``SELECT ... FOR UPDATE SKIP LOCKED``, so many
+        workers on many nodes can drain the queue without waiting for each other. On
+        the databases without it, the claims are serialized by a lock file instead of a
+        transaction, whose upgrade from a read to a write would fail on SQLite.
+        """
+        cls.fail_stale()
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        with transaction.atomic() if skip_locked else lock_queue():
+            pending = cls.objects.filter(status=cls.Status.PENDING).order_by("created")
+            if skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            if not (job := pending.first()):
+                return None
+            job.status = cls.Status.RUNNING
+            job.worker = worker
+            job.started = job.heartbeat = timezone.now()
+            job.save(  # type: ignore[no-untyped-call]
+                update_fields=["status", "worker", "started", "heartbeat", "modified"]
+            )
+        return job
+
+    @contextmanager
+    def beating(self) -> Iterator[None]:
+        """
+        Send the heartbeats of the job from a thread while it is running.
+
+        A heartbeat is sent every DJ_2TO3_JOB_HEARTBEAT seconds, so the job is not taken
+        for stale however long its action runs.
+        """
+        stopped = threading.Event()
+
+        def beat() -> None:
+            try:
+                while not stopped.wait(settings.DJ_2TO3_JOB_HEARTBEAT):
+                    Job.objects.filter(pk=self.pk, status=self.Status.RUNNING).update(
+                        heartbeat=timezone.now()
+                    )
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=beat, name=f"job-{self.pk}-heartbeat")
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def run(self) -> None:
+        """
+        Run the action on the target with the arguments and record its outcome.
+
+        The progress of an analysis or a refresh of the fixes is recorded while it runs,
+        and the counts returned by the action are recorded as its result.
+        """
+        kwargs: dict[str, Any] = dict(self.arguments)
+        if self.action in (self.Action.ANALYZE_FUTURE, self.Action.REFRESH_FIXES):
+            kwargs["progress"] = Progress(self.set_progress)
+        try:
+            if (target := self.target) is None:
+                raise LookupError(f"The object {self.object_id} does not exist.")
+            with self.beating():
+                result = getattr(target, self.action)(**kwargs)
+        except Exception:  # pylint: disable=broad-except
+            self.status = self.Status.FAILED
+            self.error = traceback.format_exc()
+        else:
+            self.status = self.Status.SUCCEEDED
+            if isinstance(result, list):
+                self.result = f"{len(result)} objects"
+            elif isinstance(result, dict):
+                self.result = ", ".join(
+                    f"{count} {key}" for key, count in result.items()
+                )
+            else:
+                self.result = ""
+        self.finished = timezone.now()
+        self.save(  # type: ignore[no-untyped-call]
+            update_fields=["status", "result", "error", "finished", "modified"]
+        )
+
+    def set_progress(self, progress: dict[str, Any]) -> None:
+        """Record the progress of the job."""
+        self.progress = progress
+        Job.objects.filter(pk=self.pk).update(progress=progress)
+
+    def get_progress(self) -> dict[str, Any]:
+        """
+        Get the progress of the job, with the elapsed time and the estimated time left.
+
+        The progress is counted in files, and the time left is estimated from the rate
+        of the files so far. The files of every fixer are the ones routed to it.
+        """
+        done: int = self.progress.get("done", 0)
+        total: int = self.progress.get("total", 0)
+        elapsed = (
+            ((self.finished or timezone.now()) - self.started).total_seconds()
+            if self.started
+            else 0.0
+        )
+        eta = (
+            elapsed * (total - done) / done
+            if done and self.status == self.Status.RUNNING
+            else None
+        )
+        return {
+            "status": self.status,
+            "status_display": self.get_status_display(),
+            "elapsed": elapsed,
+            "eta": eta,
+            "done": done,
+            "total": total,
+            "path": self.progress.get("path", ""),
+            "fixes": self.progress.get("fixes", {}),
+        }
@@ -1,18 +1,100 @@
 """The project model in this application."""
 
-import subprocess  # nosec B404
-from pathlib import Path
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import IO, Any
 
 import git
+from asgiref.sync import sync_to_async
 
-from django.db import models
+from django.db import models, transaction
 from django_extensions.db.models import TimeStampedModel
 
-from .fix import Fix
+from ..utils import (
+    FragmentCache,
+    Progress,
+    SpooledFragments,
+    detect_git_repository,
+    get_workers,
+    is_python_source,
+    iter_python_sources,
+    join_diff,
+    list_changed_files,
+    list_repository_files,
+    match_globs,
+    merge_diff,
+    open_spool,
+    run_in_pool,
+    shard_files,
+    walk_sort_key,
+)
+from .fix import Fix, get_stage
 from .project_fix import ProjectFix
+from .project_fix_file import ProjectFixFile
 from .python import PythonExecutable
 
 
+@dataclass
+class FutureAnalysis:
+    """The plan of an analysis of a project by all fixes of its future."""
+
+    fixes: dict[str, Fix]
+    digest: str
+    head: str
+    dirty: set[str] | None
+    changed: set[str] | None
+    paths: list[str]
+
+
+@dataclass
+class FixesRun:
+    """A run of fixes over the Python sources, with the diffs in the cache looked up."""
+
+    python_executable: PythonExecutable
+    cache: FragmentCache
+    names: list[str]
+    fragments: SpooledFragments
+    missing: list[str]
+    shards: list[list[str]]
+    progress: Progress | None
+
+    def on_event(self, event: dict[str, Any]) -> None:
+        """Advance the progress by the files routed to the fixers and analyzed."""
+        if not self.progress:
+            return
+        if event["type"] == "routes":
+            self.progress.route(event["fixes"])
+        elif event["type"] == "progress":
+            self.progress.advance(event["path"], fixes=event["fixes"])
+
+    def merge(self, results: Iterable[SpooledFragments]) -> None:
+        """
+        Merge the diffs of the shards into the cached diffs, and close their spools.
+
+        The shards are completed in any order, but the diffs are always joined in the
+        walk order of the files, the same whatever the number of shards.
+        """
+        for result in results:
+            with result:
+                self.fragments.update(result)
+
+    def finish(self) -> SpooledFragments:
+        """Cache the diffs of the missed files, and return the diffs of all files."""
+        if self.missing:
+            self.cache.store(self.missing, self.names, self.fragments)
+        self.cache.flush()
+        if self.progress:
+            self.progress.finish()
+        return self.fragments
+
+
 class Project(TimeStampedModel, models.Model):  # type: ignore[misc]
     """The project model."""
 
@@ -28,6 +110,140 @@ class Project(TimeStampedModel, models.Model):  # type: ignore[misc]
         PythonExecutable, blank=True, null=True, on_delete=models.CASCADE
     )
 
+    git_repository = models.BooleanField(default=False, editable=False)
+    git_head = models.CharField(max_length=40, blank=True, editable=False)
+
+    include_patterns = models.TextField(
+        blank=True,
+        help_text=(
+            "The globs of the files to analyze, one per line, e.g. src/*.py, all files "
+            "if empty. They are matched against the paths relative to the project."
+        ),
+    )
+    exclude_patterns = models.TextField(
+        blank=True,
+        help_text=(
+            "The globs of the files not to analyze, one per line, e.g. */migrations/* "
+            "or vendor/*."
+        ),
+    )
+
+    analyzed_head = models.CharField(max_length=40, blank=True, editable=False)
+    analyzed_state = models.JSONField(default=dict, editable=False)
+
+    def save(self, **kwargs: Any) -> None:
+        """Save the project with its git status."""
+        self.git_repository, self.git_head = detect_git_repository(self.path)
+        super().save(**kwargs)  # type: ignore[no-untyped-call]
+
+    @classmethod
+    def register_many(
+        cls,
+        paths: Iterable[str],
+        python_executable: PythonExecutable | None = None,
+        workers: int | None = None,
+    ) -> list[Project]:
+        """
+        Register the projects of the paths with their git status in bulk.
+
+        The git repositories are detected concurrently, and the projects are inserted
+        or updated in one statement. The Python executable of the existing projects is
+        only replaced if one is given.
+        """
+        projects = [
+            cls(
+                path=path,
+                python_executable=python_executable,
+                git_repository=git_repository,
+                git_head=git_head,
+            )
+            for path, (git_repository, git_head) in sorted(
+                run_in_pool(detect_git_repository, paths, workers)
+            )
+        ]
+        update_fields = ["git_repository", "git_head", "modified"]
+        if python_executable:
+            update_fields.append("python_executable")
+        return Project.objects.bulk_create(
+            projects,
+            update_conflicts=True,
+            unique_fields=["path"],
+            update_fields=update_fields,
+        )
+
+    @classmethod
+    def refresh_git_many(
+        cls, projects: Iterable[Project], workers: int | None = None
+    ) -> int:
+        """Refresh the git status of the projects concurrently and in bulk."""
+        projects = list(projects)
+        for project, (git_repository, git_head) in run_in_pool(
+            lambda project: detect_git_repository(project.path), projects, workers
+        ):
+            project.git_repository, project.git_head = git_repository, git_head
+        return Project.objects.bulk_update(projects, ["git_repository", "git_head"])
+
+    def refresh_git(self) -> None:
+        """Refresh the git status of the project."""
+        self.git_repository, self.git_head = detect_git_repository(self.path)
+        Project.objects.filter(pk=self.pk).update(
+            git_repository=self.git_repository, git_head=self.git_head
+        )
+
+    @property
+    def globs(self) -> tuple[list[str], list[str]]:
+        """Get the globs of the files to include and to exclude."""
+        return (
+            [
+                line.strip()
+                for line in self.include_patterns.splitlines()
+                if line.strip()
+            ],
+            [
+                line.strip()
+                for line in self.exclude_patterns.splitlines()
+                if line.strip()
+            ],
+        )
+
+    def is_selected(self, name: str) -> bool:
+        """Check if the Python source of the relative path is selected for analysis."""
+        return is_python_source(name) and match_globs(name, *self.globs)
+
+    def list_python_sources(self) -> list[str]:
+        """
+        List the Python sources of the project selected for analysis, in the walk order.
+
+        The files ignored by git are skipped if the project is a git repository, e.g.
+        the virtualenvs, the build directories and the generated code, and the files
+        are filtered by the globs of the project.
+        """
+        if (names := list_repository_files(self.path)) is None:
+            names = [
+                os.path.relpath(path, self.path)
+                for path in iter_python_sources([self.path])
+            ]
+        return sorted(
+            (
+                path
+                for name in names
+                if self.is_selected(name)
+                and os.path.isfile(path := os.path.join(self.path, name))
+            ),
+            key=walk_sort_key,
+        )
+
+    def list_fixable_sources(self) -> list[str]:
+        """
+        List the selected Python sources to run the fixes over.
+
+        None of them is listed if the fixes cannot be run, because the project has no
+        Python executable or the Python executable has no future.
+        """
+        if not self.python_executable or not self.python_executable.future:
+            return []
+        return self.list_python_sources()
+
     def is_git_repository(self) -> bool:
         """Check if the project is a git repository."""
         try:
@@ -36,39 +252,399 @@ class Project(TimeStampedModel, models.Model):  # type: ignore[misc]
             return False
         return True
 
-    def analyze_future(self) -> list[ProjectFix]:
-        """Analyze the project."""
-        project_fixes: list[ProjectFix] = []
-        if not self.python_executable:
-            return project_fixes
-        if not (future := self.python_executable.future):
-            return project_fixes
-        for fix in future.fix_set.all():
-            if not (obj := self.analyze_future_fix(fix)):
-                continue
-            project_fixes.append(obj)
-        return project_fixes
+    @classmethod
+    def analyze_future_many(
+        cls, projects: Iterable[Project], workers: int | None = None
+    ) -> dict[Project, list[ProjectFix]]:
+        """
+        Analyze the projects concurrently.
 
-    def analyze_future_fix(self, fix: Fix) -> ProjectFix | None:
-        """Analyze the future fix."""
-        if not self.python_executable:
+        The workers are shared between the projects, and the remaining workers of every
+        project are used to run its fixes concurrently.
+        """
+        projects = list(projects)
+        workers = get_workers(workers)
+        workers_per_project = max(1, workers // max(1, len(projects)))
+        return dict(
+            run_in_pool(
+                lambda project: project.analyze_future(workers=workers_per_project),
+                projects,
+                workers,
+            )
+        )
+
+    @classmethod
+    async def aanalyze_future_many(
+        cls, projects: Iterable[Project]
+    ) -> dict[Project, list[ProjectFix]]:
+        """
+        The asynchronous variant of analyze_future_many.
+
+        All projects are analyzed concurrently, and their processes share the limit of
+        the asynchronous runner.
+        """
+        listed = await sync_to_async(lambda: list(projects))()
+        results = await asyncio.gather(
+            *(project.aanalyze_future() for project in listed)
+        )
+        return dict(zip(listed, results))
+
+    def analyze_future(
+        self,
+        single_pass: bool = True,
+        workers: int | None = None,
+        incremental: bool = True,
+        progress: Progress | None = None,
+    ) -> list[ProjectFix]:
+        """
+        Analyze the project.
+
+        In the single pass mode, the files are split into one shard per worker and all
+        fixes are run over every shard in one interpreter, otherwise every fix is run by
+        its own ``futurize`` process.
+
+        In the incremental mode, only the Python sources of a git repository changed
+        since the last analysis are analyzed again, and their diffs are merged into the
+        existing ones. The fixes without any diff left are deleted.
+
+        The progress of the single pass mode is reported by file.
+        """
+        if not single_pass:
+            if not self.python_executable or not self.python_executable.future:
+                return []
+            return [
+                obj
+                for _, obj in run_in_pool(
+                    self.analyze_future_fix,
+                    self.python_executable.future.fix_set.all(),
+                    workers,
+                )
+                if obj
+            ]
+        if not (analysis := self.plan_future_analysis(incremental)):
+            return []
+        with self.run_future_fixes(
+            list(analysis.fixes), analysis.paths, workers, progress
+        ) as fragments:
+            return self.save_future_analysis(analysis, fragments)
+
+    async def aanalyze_future(
+        self,
+        workers: int | None = None,
+        incremental: bool = True,
+        progress: Progress | None = None,
+    ) -> list[ProjectFix]:
+        """The asynchronous variant of analyze_future in the single pass mode."""
+        if not (
+            analysis := await sync_to_async(self.plan_future_analysis)(incremental)
+        ):
+            return []
+        with await self.arun_future_fixes(
+            list(analysis.fixes), analysis.paths, workers, progress
+        ) as fragments:
+            return await sync_to_async(self.save_future_analysis)(analysis, fragments)
+
+    def plan_future_analysis(self, incremental: bool = True) -> FutureAnalysis | None:
+        """Plan the analysis of the project by all fixes of its future."""
+        if not (python_executable := self.python_executable):
             return None
-        result = subprocess.run(  # nosec B603
-            [
-                fix.future.get_command_path(self.python_executable),
-                "--fix",
-                fix.name,
-                self.path,
-            ],
-            capture_output=True,
-            check=True,
-            text=True,
+        if not (future := python_executable.future):
+            return None
+        if not (fixes := {fix.name: fix for fix in future.fix_set.all()}):
+            return None
+        include, exclude = self.globs
+        digest = hashlib.sha256(
+            json.dumps([str(future.version), sorted(fixes), include, exclude]).encode()
+        ).hexdigest()
+        _, head = detect_git_repository(self.path)
+        dirty = list_changed_files(self.path, head) if head else None
+        changed = self.list_changed_sources(digest) if incremental else None
+        paths = (
+            self.list_python_sources()
+            if changed is None
+            else sorted(
+                (path for path in changed if os.path.isfile(path)), key=walk_sort_key
+            )
+        )
+        return FutureAnalysis(fixes, digest, head, dirty, changed, paths)
+
+    def save_future_analysis(
+        self, analysis: FutureAnalysis, fragments: SpooledFragments
+    ) -> list[ProjectFix]:
+        """
+        Save the diffs of the analysis, merged into the existing ones if needed.
+
+        The diffs are joined from the spools, merged and upserted one fix at a time, and
+        an existing diff is loaded only when its fix is merged, so only the diff of one
+        fix is held in memory. The returned project fixes load their diffs lazily.
+        """
+        existing = self.projectfix_set.filter(fix__in=analysis.fixes.values())
+        saved: list[int] = []
+        with transaction.atomic():
+            for name, fix in analysis.fixes.items():
+                if analysis.changed is None:
+                    diff = join_diff(fragments.get(name))
+                else:
+                    project_fix = (
+                        existing.filter(fix=fix).only("diff", "diff_blob").first()
+                    )
+                    diff = merge_diff(
+                        project_fix.diff if project_fix else "",
+                        fragments.get(name),
+                        analysis.changed,
+                    )
+                if not diff:
+                    existing.filter(fix=fix).delete()
+                    continue
+                (project_fix,) = ProjectFix.upsert(
+                    [ProjectFix(project=self, fix=fix, diff=diff)]
+                )
+                saved.append(project_fix.pk)
+            self.analyzed_head = analysis.head if analysis.dirty is not None else ""
+            self.analyzed_state = {
+                "fixes": analysis.digest,
+                "dirty": sorted(analysis.dirty or []),
+            }
+            Project.objects.filter(pk=self.pk).update(
+                analyzed_head=self.analyzed_head, analyzed_state=self.analyzed_state
+            )
+        return list(
+            ProjectFix.objects.filter(pk__in=saved)
+            .select_related("fix")
+            .defer("diff")
+            .order_by("fix__name")
         )
-        if result.stderr.strip() == "RefactoringTool: No files need to be modified.":
+
+    def list_changed_sources(self, fixes_digest: str) -> set[str] | None:
+        """
+        List the Python sources changed since the last analysis.
+
+        They are the files changed since the last analyzed commit, and the files which
+        were already changed but not committed at that time. Return None if the project
+        has to be analyzed fully, because it is not a git repository or the fixes are
+        changed since the last analysis.
+
+        An added or removed module changes the diffs of the fixes of the imports of the
+        unchanged files next to it, so the files in the directories of the changed files,
+        and in their parents, are run again too; their other diffs are cached.
+        """
+        if not self.analyzed_head or self.analyzed_state.get("fixes") != fixes_digest:
             return None
-        if not result.stdout.strip():
+        if (changed := list_changed_files(self.path, self.analyzed_head)) is None:
             return None
-        obj, _ = ProjectFix.objects.update_or_create(
-            defaults={"diff": result.stdout}, project=self, fix=fix
+        changed.update(self.analyzed_state.get("dirty", []))
+        directories = {parent for name in changed for parent in PurePath(name).parents}
+        sources = {
+            os.path.join(self.path, name) for name in changed if self.is_selected(name)
+        }
+        if directories:
+            sources.update(
+                path
+                for path in self.list_python_sources()
+                if PurePath(os.path.relpath(path, self.path)).parent in directories
+            )
+        return sources
+
+    def run_future_fixes(
+        self,
+        names: list[str],
+        paths: list[str],
+        workers: int | None = None,
+        progress: Progress | None = None,
+    ) -> SpooledFragments:
+        """
+        Run the fixes over the paths and return the diffs of every file by fix.
+
+        The diffs of the files are looked up in the cache first. The missed files are
+        split into one shard per worker balanced by their sizes, all fixes are run over
+        every shard in one interpreter, so every file is parsed once, and the results
+        are cached. All files are run in one shard by the in-process engine, whose
+        threads would only contend for the GIL. The cached files are reported as
+        analyzed at once. The diffs are spooled by fix, and their spools are closed by
+        the returned fragments as a context manager.
+        """
+        if not (run := self.start_future_fixes(names, paths, workers, progress)):
+            return SpooledFragments()
+
+        def run_shard(shard: list[str]) -> SpooledFragments:
+            return run.python_executable.analyze(names, shard, run.on_event)
+
+        results = run_in_pool(run_shard, run.shards, len(run.shards))
+        run.merge(result for _, result in results)
+        return run.finish()
+
+    async def arun_future_fixes(
+        self,
+        names: list[str],
+        paths: list[str],
+        workers: int | None = None,
+        progress: Progress | None = None,
+    ) -> SpooledFragments:
+        """
+        The asynchronous variant of run_future_fixes.
+
+        The shards are run concurrently under the limit of the asynchronous runner, and
+        the progress of the files of a shard is reported once it is finished.
+        """
+        run = await sync_to_async(self.start_future_fixes)(
+            names, paths, workers, progress
+        )
+        if not run:
+            return SpooledFragments()
+
+        results = await asyncio.gather(
+            *(
+                run.python_executable.aanalyze(names, shard, on_event=run.on_event)
+                for shard in run.shards
+            )
         )
+        await sync_to_async(run.merge)(results)
+        return await sync_to_async(run.finish)()
+
+    def start_future_fixes(
+        self,
+        names: list[str],
+        paths: list[str],
+        workers: int | None = None,
+        progress: Progress | None = None,
+    ) -> FixesRun | None:
+        """Start a run of the fixes over the paths, with the cached diffs looked up."""
+        if not (python_executable := self.python_executable) or not paths:
+            return None
+        if not (future := python_executable.future):
+            return None
+        cache = FragmentCache(
+            str(future.version), python_executable.environment["version"]
+        )
+        sources = list(iter_python_sources(paths))
+        fragments, missing = cache.lookup(sources, names)
+        if progress:
+            progress.start(len(sources))
+            progress.advance(count=len(sources) - len(missing))
+        shards = 1 if python_executable.in_process else get_workers(workers)
+        return FixesRun(
+            python_executable,
+            cache,
+            names,
+            fragments,
+            missing,
+            shard_files(missing, shards),
+            progress,
+        )
+
+    def analyze_future_fix(self, fix: Fix) -> ProjectFix | None:
+        """
+        Analyze the future fix.
+
+        ``futurize`` is run over the selected Python sources of the project only. The
+        diff printed by it is spooled as it is read, so only the diff to save is held in
+        memory.
+        """
+        if not self.python_executable or not (paths := self.list_python_sources()):
+            return None
+        with open_spool(text=True) as stdout:
+            result = self.python_executable.futurize(
+                "--fix", fix.name, *paths, stdout=stdout
+            )
+            return self.save_future_fix(fix, result, stdout)
+
+    async def aanalyze_future_fix(self, fix: Fix) -> ProjectFix | None:
+        """The asynchronous variant of analyze_future_fix."""
+        if not (python_executable := await self.aget_python_executable()):
+            return None
+        if not (paths := await sync_to_async(self.list_python_sources)()):
+            return None
+        with open_spool(text=True) as stdout:
+            result = await python_executable.afuturize(
+                "--fix", fix.name, *paths, stdout=stdout
+            )
+            return await sync_to_async(self.save_future_fix)(fix, result, stdout)
+
+    def save_future_fix(
+        self, fix: Fix, result: dict[str, Any], stdout: IO[str]
+    ) -> ProjectFix | None:
+        """Save the diff of the fix spooled from the output of ``futurize``."""
+        if result["stderr"].strip() == "RefactoringTool: No files need to be modified.":
+            return None
+        stdout.seek(0)
+        if not (diff := stdout.read()).strip():
+            return None
+        (obj,) = ProjectFix.upsert([ProjectFix(project=self, fix=fix, diff=diff)])
         return obj
+
+    def refresh_fixes(
+        self,
+        fixes: Iterable[str] | None = None,
+        workers: int | None = None,
+        progress: Progress | None = None,
+    ) -> dict[str, int]:
+        """
+        Refresh the project fixes, all of them unless the fixes are given, at once.
+
+        All fixes are run over the project in one pass. The changed project fixes are
+        then saved and the ones without any diff left deleted, one at a time in one
+        transaction, so only the diff of one fix is held in memory. Return the numbers
+        of the changed, the unchanged and the deleted project fixes, or nothing if the
+        fixes cannot be run or there is no Python source to run them over, so the
+        project fixes are not deleted by mistake.
+        """
+        if not (paths := self.list_fixable_sources()):
+            return {}
+        project_fixes = self.projectfix_set.select_related("fix").defer("diff")
+        if fixes is not None:
+            project_fixes = project_fixes.filter(fix__name__in=list(fixes))
+        names = list(project_fixes.values_list("fix__name", flat=True))
+        changed = 0
+        deleted: list[int] = []
+        with self.run_future_fixes(names, paths, workers, progress) as fragments:
+            with transaction.atomic():
+                for project_fix in project_fixes.iterator():
+                    if not (diff := join_diff(fragments.get(project_fix.fix.name))):
+                        deleted.append(project_fix.pk)
+                    elif diff != project_fix.diff:
+                        project_fix.diff = diff
+                        project_fix.save_diff()
+                        changed += 1
+                ProjectFix.objects.filter(pk__in=deleted).delete()
+        return {
+            "changed": changed,
+            "unchanged": len(names) - changed - len(deleted),
+            "deleted": len(deleted),
+        }
+
+    def apply_fixes(self, fixes: Iterable[str]) -> list[str]:
+        """
+        Apply the fixes to the project in one pass of ``futurize`` per stage.
+
+        The fixes of the stage 1 are applied before the ones of the stage 2, and every
+        pass only writes the files in the diffs of its fixes. All project fixes are then
+        refreshed by one incremental analysis. Return the applied files.
+        """
+        if not (python_executable := self.python_executable):
+            return []
+        stages: dict[int, tuple[set[str], set[str]]] = {}
+        for name, category, path in ProjectFixFile.objects.filter(
+            project_fix__project=self, project_fix__fix__name__in=list(fixes)
+        ).values_list("project_fix__fix__name", "project_fix__fix__category", "path"):
+            names, paths = stages.setdefault(get_stage(category), (set(), set()))
+            names.add(name)
+            paths.add(path)
+        applied: set[str] = set()
+        for stage in sorted(stages):
+            names, paths = stages[stage]
+            if not (files := [path for path in paths if os.path.isfile(path)]):
+                continue
+            python_executable.futurize(
+                *(arg for name in sorted(names) for arg in ("--fix", name)),
+                "--write",
+                "--no-diffs",
+                *sorted(files, key=walk_sort_key),
+            )
+            applied.update(files)
+        if applied:
+            self.analyze_future()
+        return sorted(applied, key=walk_sort_key)
+
+    async def aget_python_executable(self) -> PythonExecutable | None:
+        """Get the Python executable of the project from an asynchronous context."""
+        return await sync_to_async(lambda: self.python_executable)()
@@ -1,11 +1,26 @@
 """The project_fix model in this application."""
 
-import subprocess  # nosec B404
+from __future__ import annotations
 
-from django.db import models
+from collections.abc import Collection, Iterable, Mapping
+
+from asgiref.sync import sync_to_async
+
+from django.db import models, transaction
 from django_extensions.db.models import TimeStampedModel
 from django_stubs_ext.db.models import TypedModelMeta
 
+from ..utils import (
+    PatchError,
+    SpooledFragments,
+    join_diff,
+    merge_diff,
+    patch_file,
+    write_patched,
+)
+from .fields import CompressedTextField
+from .project_fix_file import ProjectFixFile
+
 
 class ProjectFix(TimeStampedModel, models.Model):  # type: ignore[misc]
     """The project_fix model."""
@@ -13,7 +28,13 @@ class ProjectFix(TimeStampedModel, models.Model):  # type: ignore[misc]
     project = models.ForeignKey("dj_2to3.Project", on_delete=models.CASCADE)
     fix = models.ForeignKey("dj_2to3.Fix", on_delete=models.CASCADE)
 
-    diff = models.TextField()
+    diff = CompressedTextField(blob_field="diff_blob")
+    diff_blob = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="The sha256 of the diff in the blob store, if it is too big.",
+    )
 
     class Meta(TypedModelMeta):
         """The Meta class for ProjectFix."""
@@ -25,42 +46,159 @@ class ProjectFix(TimeStampedModel, models.Model):  # type: ignore[misc]
             )
         ]
 
-    def apply_fix(self) -> None:
-        """Apply the fix."""
+    @classmethod
+    def upsert(cls, project_fixes: Iterable[ProjectFix]) -> list[ProjectFix]:
+        """
+        Insert or update the given project fixes in one statement.
+
+        The conflicts on the unique project and fix are resolved by the database, so
+        it is safe to upsert the same rows from concurrent analyses. The files of their
+        diffs are replaced in bulk too.
+        """
+        with transaction.atomic():
+            project_fixes = ProjectFix.objects.bulk_create(
+                project_fixes,
+                update_conflicts=True,
+                unique_fields=["project", "fix"],
+                update_fields=["diff", "diff_blob", "modified"],
+            )
+            ProjectFixFile.replace(project_fixes)
+        return project_fixes
+
+    def save_diff(self) -> None:
+        """Save the diff of the project fix, and replace its files."""
+        with transaction.atomic():
+            self.save()  # type: ignore[no-untyped-call]
+            ProjectFixFile.replace([self])
+
+    def apply_fix(
+        self,
+        paths: Collection[str] | None = None,
+        hunks: Mapping[str, Collection[int]] | None = None,
+    ) -> list[str]:
+        """
+        Apply the fix to the files of the project, or only to the given files.
+
+        The stored diff of a file is patched into it if the file is unchanged since it
+        was analyzed, and the fixer is run again only over the other files. Only the
+        given hunks of a file are applied if any. The applied files are analyzed again
+        by the fix, and their diffs are replaced. Return the applied files.
+        """
         if not (python_executable := self.project.python_executable):
+            return []
+        patched, stale, missing = self.patch_files(paths, hunks)
+        if stale:
+            python_executable.futurize(
+                "--fix", self.fix.name, "--write", "--no-diffs", *stale
+            )
+        applied = patched + stale
+        with self.project.run_future_fixes([self.fix.name], applied) as fragments:
+            self.save_applied(applied + missing, fragments)
+        return applied
+
+    async def aapply_fix(
+        self,
+        paths: Collection[str] | None = None,
+        hunks: Mapping[str, Collection[int]] | None = None,
+    ) -> list[str]:
+        """The asynchronous variant of apply_fix."""
+        project, fix = await sync_to_async(lambda: (self.project, self.fix))()
+        if not (python_executable := await project.aget_python_executable()):
+            return []
+        patched, stale, missing = await sync_to_async(self.patch_files)(paths, hunks)
+        if stale:
+            await python_executable.afuturize(
+                "--fix", fix.name, "--write", "--no-diffs", *stale
+            )
+        applied = patched + stale
+        with await project.arun_future_fixes([fix.name], applied) as fragments:
+            await sync_to_async(self.save_applied)(applied + missing, fragments)
+        return applied
+
+    def patch_files(
+        self,
+        paths: Collection[str] | None = None,
+        hunks: Mapping[str, Collection[int]] | None = None,
+    ) -> tuple[list[str], list[str], list[str]]:
+        """
+        Patch the stored diffs into the files unchanged since they were analyzed.
+
+        All files are checked before any of them is written. Return the patched files,
+        the stale files left to the fixer and the missing files. A stale file with
+        selected hunks is an error, because the fixer cannot apply only some of them.
+        """
+        hunks = hunks or {}
+        # The files of the related manager share this project fix, so the blob of its
+        # diff is not queried again for every file
+        files = self.projectfixfile_set.all()
+        if paths is not None:
+            files = files.filter(path__in=paths)
+        contents: dict[str, bytes] = {}
+        stale: list[str] = []
+        missing: list[str] = []
+        for file in files.iterator():
+            try:
+                contents[file.path] = patch_file(
+                    file.path,
+                    file.read_diff(),
+                    file.hunks,
+                    file.sha256,
+                    hunks.get(file.path),
+                )
+            except FileNotFoundError:
+                missing.append(file.path)
+            except (OSError, PatchError) as exc:
+                if file.path in hunks:
+                    raise PatchError(
+                        f"Failed to apply the hunks to {file.path}: {exc}"
+                    ) from exc
+                stale.append(file.path)
+        for path, data in contents.items():
+            write_patched(path, data)
+        return list(contents), stale, missing
+
+    def save_applied(self, paths: list[str], fragments: SpooledFragments) -> None:
+        """
+        Replace the diffs of the applied files by the ones analyzed again.
+
+        The project fix is deleted if no diff is left.
+        """
+        if not paths:
+            return
+        diff = merge_diff(self.diff, fragments.get(self.fix.name), paths)
+        if not diff:
+            self.delete()
             return
-        subprocess.run(  # nosec B603
-            [
-                self.fix.future.get_command_path(python_executable),
-                "--fix",
-                self.fix.name,
-                "--write",
-                self.project.path,
-            ],
-            capture_output=True,
-            check=True,
-            text=True,
-        )
+        self.diff = diff
+        self.save_diff()
 
     def refresh_fix(self) -> tuple[int, dict[str, int]] | None:
-        """Refresh the fix."""
-        if not (python_executable := self.project.python_executable):
+        """
+        Refresh the fix.
+
+        The unchanged files are served by the cache of the diffs of the files. Nothing is
+        refreshed if the fixes cannot be run or there is no Python source to run them
+        over, so the project fix is not deleted by mistake.
+        """
+        if not (paths := self.project.list_fixable_sources()):
             return None
-        result = subprocess.run(  # nosec B603
-            [
-                self.fix.future.get_command_path(python_executable),
-                "--fix",
-                self.fix.name,
-                self.project.path,
-            ],
-            capture_output=True,
-            check=True,
-            text=True,
-        )
-        if result.stderr.strip() == "RefactoringTool: No files need to be modified.":
-            return self.delete()
-        if not (stdout := result.stdout.strip()):
+        with self.project.run_future_fixes([self.fix.name], paths) as fragments:
+            diff = join_diff(fragments.get(self.fix.name))
+        if not diff:
             return self.delete()
-        self.diff = stdout
-        self.save()
+        self.diff = diff
+        self.save_diff()
+        return None
+
+    async def arefresh_fix(self) -> tuple[int, dict[str, int]] | None:
+        """The asynchronous variant of refresh_fix."""
+        project, fix = await sync_to_async(lambda: (self.project, self.fix))()
+        if not (paths := await sync_to_async(project.list_fixable_sources)()):
+            return None
+        with await project.arun_future_fixes([fix.name], paths) as fragments:
+            diff = await sync_to_async(join_diff)(fragments.get(fix.name))
+        if not diff:
+            return await self.adelete()
+        self.diff = diff
+        await sync_to_async(self.save_diff)()
         return None
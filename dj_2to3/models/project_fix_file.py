@@ -0,0 +1,146 @@
+"""The project_fix_file model in this application."""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django_extensions.db.models import TimeStampedModel
+from django_stubs_ext.db.models import TypedModelMeta
+
+from ..utils import hash_file, index_diff, read_blob, split_diff
+from .fields import CompressedTextField
+
+if TYPE_CHECKING:
+    from .project_fix import ProjectFix
+
+
+class ProjectFixFile(TimeStampedModel, models.Model):  # type: ignore[misc]
+    """
+    The project_fix_file model.
+
+    It is the diff of one file of a project fix, with its added and removed lines
+    counted and its hunks indexed, so a file is loaded and aggregated without parsing
+    the diff of the whole project. The diff is compressed like the one of the project
+    fix, and the diff of a file of a project fix in the blob store is not saved, it is
+    sliced out of the blob instead.
+    """
+
+    project_fix = models.ForeignKey("dj_2to3.ProjectFix", on_delete=models.CASCADE)
+    path = models.CharField(max_length=1024)
+
+    diff = CompressedTextField()
+    offset = models.PositiveBigIntegerField(
+        help_text="The offset in characters of the diff in the one of the project fix."
+    )
+    size = models.PositiveBigIntegerField(
+        default=0, help_text="The size in bytes of the diff."
+    )
+    blob_offset = models.PositiveBigIntegerField(
+        default=0,
+        help_text="The offset in bytes of the diff in the one of the project fix.",
+    )
+    lines_added = models.PositiveIntegerField(default=0)
+    lines_removed = models.PositiveIntegerField(default=0)
+    hunks = models.JSONField(
+        default=list,
+        help_text="The offset in the diff, the old start, the old count, the new start "
+        "and the new count of every hunk.",
+    )
+    sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="The sha256 of the content of the file when the diff is saved.",
+    )
+
+    class Meta(TypedModelMeta):
+        """The Meta class for ProjectFixFile."""
+
+        verbose_name = "Project Fix File"
+        ordering = ["project_fix", "offset"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project_fix", "path"], name="unique_project_fix_file"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return self.path
+
+    def read_diff(self) -> str:
+        """Read the diff, sliced out of the blob of the project fix if it is in one."""
+        if self.diff or not (blob := self.project_fix.diff_blob):
+            return str(self.diff)
+        return read_blob(blob, self.blob_offset, self.size).decode()
+
+    def apply_fix(self, hunks: Collection[int] | None = None) -> list[str]:
+        """Apply the fix to this file only, or only the given hunks of it."""
+        return self.project_fix.apply_fix(
+            [self.path], None if hunks is None else {self.path: hunks}
+        )
+
+    @classmethod
+    def replace(
+        cls, project_fixes: Iterable[ProjectFix], hashed: bool = True
+    ) -> list[ProjectFixFile]:
+        """
+        Replace the files of the project fixes by the ones split from their diffs.
+
+        The files are upserted in bulk, the conflicts on the unique project fix and path
+        being resolved by the database, and only the files not in the diffs any more are
+        deleted, so it is safe to replace the files of the same project fixes from
+        concurrent analyses. The content of every file is hashed once, however many
+        fixes change it, unless it is not hashed at all. The diffs of the files of a
+        project fix in the blob store are not saved.
+        """
+        project_fixes = list(project_fixes)
+        digests: dict[str, str | None] = {}
+        paths: dict[int, list[str]] = {}
+        files = []
+        for project_fix in project_fixes:
+            offset = blob_offset = 0
+            for path, diff in split_diff(project_fix.diff).items():
+                paths.setdefault(project_fix.pk, []).append(path)
+                lines_added, lines_removed, hunks = index_diff(diff)
+                size = len(diff.encode())
+                if hashed and path not in digests:
+                    digests[path] = hash_file(path)
+                files.append(
+                    cls(
+                        project_fix=project_fix,
+                        path=path,
+                        diff="" if project_fix.diff_blob else diff,
+                        offset=offset,
+                        size=size,
+                        blob_offset=blob_offset,
+                        lines_added=lines_added,
+                        lines_removed=lines_removed,
+                        hunks=hunks,
+                        sha256=digests.get(path) or "",
+                    )
+                )
+                offset += len(diff)
+                blob_offset += size
+        files = ProjectFixFile.objects.bulk_create(
+            files,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["project_fix", "path"],
+            update_fields=[
+                "diff",
+                "offset",
+                "size",
+                "blob_offset",
+                "lines_added",
+                "lines_removed",
+                "hunks",
+                "sha256",
+                "modified",
+            ],
+        )
+        for project_fix in project_fixes:
+            cls.objects.filter(project_fix=project_fix).exclude(
+                path__in=paths.get(project_fix.pk, [])
+            ).delete()
+        return files
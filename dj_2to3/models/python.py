@@ -2,106 +2,374 @@
 
 from __future__ import annotations
 
+import io
+import json
+import os
 import subprocess  # nosec B404
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
+from typing import IO, Any
 
+from asgiref.sync import sync_to_async
 from packaging.version import Version, parse
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from django_extensions.db.models import TimeStampedModel
 from django_stubs_ext.db.models import TypedModelMeta
 
+from ..utils import (
+    SpooledFragments,
+    analyze_in_process,
+    close_workers,
+    is_in_process_compatible,
+    iter_events,
+    iter_spooled_events,
+    open_spool,
+    run_async,
+    run_in_worker,
+)
 from .future import Future
 
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+PACKAGES = ["future", "modernize", "six", "bandit", "radon", "pylint"]
+
+DEPENDENCIES = ["future", "modernize", "six"]
+
 
 def validate_python_executable(path: str) -> None:
     """Validate the Python executable."""
     path_ = Path(path)
     if not path_.is_file():
-        raise ValueError(f"Invalid Python executable: {path_}.")
+        raise ValidationError(f"Invalid Python executable: {path_}.")
     if not path_.stat().st_mode & 0o111:
-        raise ValueError(f"Python executable is not executable: {path_}.")
+        raise ValidationError(f"Python executable is not executable: {path_}.")
 
 
 def check_package_installed(obj: PythonExecutable, package: str) -> bool:
     """Check if the given package is installed."""
-    if obj.version < Version("3"):
-        command = [
-            obj.path,
-            "-c",
-            f"import imp; imp.find_module('{package}')",
-        ]
-        try:
-            _ = subprocess.run(  # nosec B603
-                command, capture_output=True, check=True, text=True
-            )
-        except subprocess.CalledProcessError:
-            return False
-        return True
-
-    command = [
-        obj.path,
-        "-c",
-        "import importlib.util; "
-        f"print(importlib.util.find_spec('{package}') is not None)",
-    ]
-    result = subprocess.run(  # nosec B603
-        command, capture_output=True, check=True, text=True
-    )
-    return result.stdout.strip() == "True"
+    if (installed := obj.environment["packages"].get(package)) is None:
+        (event,) = obj.run_script("probe", {"packages": [package]})
+        installed = event["packages"][package]
+    return bool(installed)
+
+
+def collect_futurize(
+    events: Iterable[dict[str, Any]],
+    args: Sequence[str],
+    stdout: IO[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Collect the output of ``futurize`` from its events, and raise an error if it fails.
+
+    The chunks of the standard output are written to the file as they are read if one
+    is given, and the returned standard output is left empty.
+    """
+    buffer = io.StringIO()
+    output: dict[str, Any] = {}
+    for event in events:
+        if event["type"] == "stdout":
+            (buffer if stdout is None else stdout).write(event["data"])
+        elif event["type"] == "output":
+            output = event
+    output["stdout"] = buffer.getvalue()
+    if output["returncode"]:
+        raise subprocess.CalledProcessError(
+            output["returncode"],
+            ["futurize", *args],
+            output["stdout"],
+            output["stderr"],
+        )
+    return output
+
+
+def get_fragments(
+    events: Iterable[dict[str, Any]],
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> SpooledFragments:
+    """
+    Spool the diffs by fix and file from the events of the script analyze.
+
+    The other events are passed to the callback.
+    """
+    fragments = SpooledFragments()
+    for event in events:
+        if event["type"] == "diff":
+            fragments.add(event["fix"], event["path"], event["diff"])
+        elif on_event:
+            on_event(event)
+    return fragments
 
 
 class PythonExecutable(TimeStampedModel, models.Model):  # type: ignore[misc]
     """The Python executable model."""
 
-    path = models.FilePathField(
-        path=str(Path.home()),
-        match=r"^python([23]\.[0-9]{,2}){,1}$",
-        recursive=True,
-        allow_files=True,
-        allow_folders=False,
+    path = models.CharField(
+        max_length=255,
         validators=[validate_python_executable],
         primary_key=True,
+        help_text="The candidates are found by the command discover_pythons.",
     )
     future = models.ForeignKey(Future, on_delete=models.CASCADE, blank=True, null=True)
 
+    environment_snapshot = models.JSONField(default=dict, editable=False)
+    environment_signature = models.JSONField(default=list, editable=False)
+
     class Meta(TypedModelMeta):
         """The Meta class for PythonExecutable."""
 
         verbose_name = "Python Executable"
 
     @property
-    def version(self) -> Version:
-        """Get the version of the Python executable."""
-        try:
-            result = subprocess.run(  # nosec B603
-                [self.path, "--version"],
-                capture_output=True,
-                check=True,
-                text=True,
+    def environment(self) -> dict[str, Any]:
+        """
+        Get the environment of the Python executable.
+
+        The snapshot of the environment is probed again only when the signature of the
+        Python executable or of its site-packages directories is changed, and it is
+        persisted immediately for a saved Python executable.
+        """
+        environment: dict[str, Any] = self.environment_snapshot
+        if (
+            environment
+            and self.environment_signature == self.get_environment_signature()
+        ):
+            return environment
+        self.environment_snapshot = environment = self.probe_environment()
+        self.environment_signature = self.get_environment_signature()
+        if not self._state.adding:
+            PythonExecutable.objects.filter(pk=self.pk).update(
+                environment_snapshot=self.environment_snapshot,
+                environment_signature=self.environment_signature,
             )
+        return environment
+
+    def get_environment_signature(self) -> list[list[Any]]:
+        """
+        Get the signature of the environment.
+
+        It is made of the mtime and the inode of the Python executable and of the
+        site-packages directories of the last snapshot, all of them change when the
+        interpreter is replaced or a package is installed, upgraded or removed.
+        """
+        paths = [self.path, *self.environment_snapshot.get("site_packages", [])]
+        signature: list[list[Any]] = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append([path, None, None])
+            else:
+                signature.append([path, stat.st_mtime_ns, stat.st_ino])
+        return signature
+
+    def probe_environment(self) -> dict[str, Any]:
+        """
+        Probe the environment of the Python executable.
+
+        The version, the version of future, the installed status of the packages, the
+        site-packages directories and the installed distributions are probed by one
+        call of the Python executable. The warm workers loaded from the previous
+        environment are stopped first.
+        """
+        close_workers(self.path)
+        try:
+            (event,) = self.run_script("probe", {"packages": PACKAGES})
         except subprocess.CalledProcessError as exc:
-            raise ValueError(
-                f"Failed to get version of Python executable: {exc}."
-            ) from exc
+            raise ValueError(f"Failed to probe the Python executable: {exc}.") from exc
         except PermissionError as exc:
             raise ValueError(f"Permission denied: {exc}.") from exc
-        return parse((result.stdout.strip() or result.stderr.strip()).split(" ")[-1])
+        except OSError as exc:
+            raise ValueError(f"Failed to run the Python executable: {exc}.") from exc
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Not a Python executable: {exc}.") from exc
+        return event
 
-    def save(self, **kwargs):
-        """Save the Python executable."""
-        if check_package_installed(self, "future"):
-            result = subprocess.run(  # nosec B603
-                [
-                    self.path,
-                    "-c",
-                    "import future; print(future.__version__)",
-                ],
-                capture_output=True,
-                check=True,
-                text=True,
+    def clean(self) -> None:
+        """
+        Check that the path is a Python interpreter by probing its environment.
+
+        The probed environment is kept, so it is not probed again when it is saved.
+        """
+        super().clean()
+        try:
+            validate_python_executable(self.path)
+        except ValidationError:
+            # Reported by the validator of the field
+            return
+        try:
+            self.environment  # pylint: disable=pointless-statement
+        except ValueError as exc:
+            raise ValidationError({"path": str(exc)}) from exc
+
+    @property
+    def version(self) -> Version:
+        """Get the version of the Python executable."""
+        return parse(self.environment["version"])
+
+    def run_script(
+        self,
+        script: str,
+        payload: Any = None,
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Run the given script of this application and yield its events.
+
+        The script is run by a warm worker of this Python executable, unless the warm
+        workers are disabled by the setting DJ_2TO3_WORKER_MAX_JOBS. The events are
+        parsed one at a time as they are read from the script, and every event is also
+        passed to the callback.
+        """
+        if settings.DJ_2TO3_WORKER_MAX_JOBS:
+            yield from run_in_worker(self.path, script, payload, on_event)
+            return
+        args = [self.path, str(SCRIPTS_DIR / f"{script}.py")]
+        with tempfile.TemporaryFile() as stderr, subprocess.Popen(  # nosec B603
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+        ) as process:
+            assert process.stdin and process.stdout  # nosec B101
+            try:
+                try:
+                    process.stdin.write(json.dumps(payload))
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                yield from iter_events(process.stdout, on_event)
+            except BaseException:
+                process.kill()
+                raise
+            if returncode := process.wait():
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(
+                    returncode, args, stderr=stderr.read().decode(errors="replace")
+                )
+
+    async def arun_script(
+        self, script: str, payload: Any = None, timeout: float | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        The asynchronous variant of run_script.
+
+        The script is run by a new process of this Python executable under the limit of
+        concurrency and the timeout of the asynchronous runner. Its output is spooled,
+        and the events are parsed one at a time as they are iterated.
+        """
+        spool = open_spool()
+        try:
+            await run_async(
+                [self.path, str(SCRIPTS_DIR / f"{script}.py")],
+                json.dumps(payload),
+                timeout,
+                stdout=spool,
             )
-            future, _ = Future.objects.get_or_create(version=result.stdout.strip())
+        except BaseException:
+            spool.close()
+            raise
+        return iter_spooled_events(spool)
+
+    def futurize(self, *args: str, stdout: IO[str] | None = None) -> dict[str, Any]:
+        """
+        Run ``futurize`` of this Python executable with the arguments.
+
+        Return its return code and its output, and raise an error if it fails. If a
+        file is given, e.g. a spool, the standard output is written to it in chunks
+        instead, so a big diff is never held in memory.
+        """
+        return collect_futurize(
+            self.run_script("futurize", {"args": list(args)}), args, stdout
+        )
+
+    async def afuturize(
+        self, *args: str, stdout: IO[str] | None = None, timeout: float | None = None
+    ) -> dict[str, Any]:
+        """The asynchronous variant of futurize."""
+        return collect_futurize(
+            await self.arun_script("futurize", {"args": list(args)}, timeout),
+            args,
+            stdout,
+        )
+
+    @property
+    def in_process(self) -> bool:
+        """Check if the fixes of this Python executable can be run by the server."""
+        return is_in_process_compatible(self.environment)
+
+    def analyze(
+        self,
+        fixes: list[str],
+        paths: list[str],
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> SpooledFragments:
+        """
+        Run the fixes over the paths in one pass and return the diffs by fix and file.
+
+        The fixes are run by the server itself if it is compatible with this Python
+        executable, otherwise by the script analyze run by this Python executable.
+        Every event, e.g. the progress of every file, is passed to the callback.
+        """
+        payload = {"fixes": fixes, "paths": paths}
+        return get_fragments(
+            analyze_in_process(payload, on_event)
+            if self.in_process
+            else self.run_script("analyze", payload, on_event)
+        )
+
+    async def aanalyze(
+        self,
+        fixes: list[str],
+        paths: list[str],
+        timeout: float | None = None,
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> SpooledFragments:
+        """
+        The asynchronous variant of analyze.
+
+        The in-process engine is run in a thread of its own. The events are spooled,
+        and passed to the callback once all files are analyzed.
+        """
+        payload = {"fixes": fixes, "paths": paths}
+        if await sync_to_async(lambda: self.in_process)():
+            events = await sync_to_async(
+                lambda: analyze_in_process(payload), thread_sensitive=False
+            )()
+        else:
+            events = await self.arun_script("analyze", payload, timeout)
+        return await sync_to_async(get_fragments)(events, on_event)
+
+    def install_dependencies(self) -> None:
+        """
+        Install the dependencies into this Python executable.
+
+        The warm workers loaded from the previous environment are stopped.
+        """
+        subprocess.run(  # nosec B603
+            [self.path, "-m", "pip", "install", "--upgrade", *DEPENDENCIES],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        close_workers(self.path)
+
+    async def ainstall_dependencies(self, timeout: float | None = None) -> None:
+        """The asynchronous variant of install_dependencies."""
+        await run_async(
+            [self.path, "-m", "pip", "install", "--upgrade", *DEPENDENCIES],
+            timeout=timeout,
+        )
+        await sync_to_async(close_workers, thread_sensitive=False)(self.path)
+
+    def save(self, **kwargs: Any) -> None:
+        """Save the Python executable."""
+        if version := self.environment["future"]:
+            future, _ = Future.objects.get_or_create(version=version)
             self.future = future
 
-        super().save(**kwargs)
+        super().save(**kwargs)  # type: ignore[no-untyped-call]
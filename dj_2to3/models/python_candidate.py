@@ -0,0 +1,57 @@
+"""The Python candidate model in this application."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import models
+from django_extensions.db.models import TimeStampedModel
+from django_stubs_ext.db.models import TypedModelMeta
+
+from ..utils import discover_pythons
+
+
+class PythonCandidate(TimeStampedModel, models.Model):  # type: ignore[misc]
+    """The Python executable found by the discovery, a candidate to be registered."""
+
+    path = models.CharField(max_length=255, primary_key=True)
+
+    class Meta(TypedModelMeta):
+        """The Meta class for PythonCandidate."""
+
+        verbose_name = "Python Candidate"
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    @classmethod
+    def rescan(
+        cls, roots: Iterable[str] | None = None, full: bool = False
+    ) -> tuple[int, int]:
+        """
+        Rescan the roots and update the candidates under them.
+
+        The roots are the setting DJ_2TO3_DISCOVERY_ROOTS by default. Return the numbers
+        of the added and the removed candidates.
+        """
+        added = removed = 0
+        for root in roots or settings.DJ_2TO3_DISCOVERY_ROOTS:
+            root = os.path.abspath(root)
+            found = set(discover_pythons(root, full))
+            existing = set(
+                cls.objects.filter(path__startswith=os.path.join(root, "")).values_list(
+                    "path", flat=True
+                )
+            )
+            added += len(
+                PythonCandidate.objects.bulk_create(
+                    [PythonCandidate(path=path) for path in sorted(found - existing)],
+                    ignore_conflicts=True,
+                )
+            )
+            missing = sorted(existing - found)
+            for i in range(0, len(missing), 500):
+                removed += cls.objects.filter(path__in=missing[i : i + 500]).delete()[0]
+        return added, removed
@@ -0,0 +1,356 @@
+"""
+Run many fixers over the given files and directories in a single pass.
+
+This script is executed by the target Python executable, so it must stay compatible
+with both Python 2 and Python 3 and must not import anything from Django.
+
+Every file is read and parsed once, and every fixer is applied to its own clone of the
+parsed tree. The diff of every file is the same as the one printed by ``futurize --fix
+<name> <path>``.
+
+A fixer can only change a file in which at least one of the names or the operators of
+its pattern appears, so the tokens of every file are indexed by a regular expression
+first, and a fixer is routed to a file only if they intersect the tokens of the fixer.
+The index over-approximates, e.g. it includes the names in the comments and the
+strings, and the names in the pattern of a fixer are added to its listed tokens unless
+they only match next to them, so no diff is missed. A file which no fixer can change is
+not even parsed. All files are routed before any of them is parsed, so the number of
+the files routed to every fixer is known up front.
+
+The analyzer can also be loaded by the server itself, see ``dj_2to3.utils.engine``,
+so it runs in-process when the server is compatible with the Python executable.
+
+The payload is read from stdin as a JSON object:
+
+    {"fixes": ["lib2to3.fixes.fix_apply", ...], "paths": ["/path/to/project", ...]}
+
+The events are written to stdout as JSON lines:
+
+    {"type": "diff", "fix": "lib2to3.fixes.fix_apply", "path": "...", "diff": "..."}
+    {"type": "error", "path": "...", "message": "..."}
+    {"type": "routes", "fixes": {"lib2to3.fixes.fix_apply": 3, ...}}
+    {"type": "progress", "path": "...", "fixes": ["lib2to3.fixes.fix_apply", ...]}
+
+The routes event, the number of the files routed to every fixer, is written once before
+the diffs. The progress event of a file, with the fixers routed to it, is written once
+all of them are run over it.
+"""
+
+import json
+import os
+import re
+import sys
+import warnings
+
+try:
+    from typing import Callable, Optional  # pylint: disable=unused-import
+except ImportError:  # Python 2 without the backport of typing
+    pass
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from lib2to3 import pygram, refactor
+    from lib2to3.main import diff_texts
+
+# The tokens of which at least one must appear in a file for the fixer to change it, the
+# fixers not listed here, e.g. the ones matching any import, are run over every file
+FIXER_TOKENS = {
+    "lib2to3.fixes.fix_apply": ["apply"],
+    "lib2to3.fixes.fix_dict": [
+        "items",
+        "iteritems",
+        "iterkeys",
+        "itervalues",
+        "keys",
+        "values",
+        "viewitems",
+        "viewkeys",
+        "viewvalues",
+    ],
+    "lib2to3.fixes.fix_except": ["except"],
+    "lib2to3.fixes.fix_exec": ["exec"],
+    "lib2to3.fixes.fix_exitfunc": ["exitfunc"],
+    "lib2to3.fixes.fix_filter": ["filter"],
+    "lib2to3.fixes.fix_funcattrs": [
+        "func_closure",
+        "func_code",
+        "func_defaults",
+        "func_dict",
+        "func_doc",
+        "func_globals",
+        "func_name",
+    ],
+    "lib2to3.fixes.fix_getcwdu": ["getcwdu"],
+    "lib2to3.fixes.fix_has_key": ["has_key"],
+    "lib2to3.fixes.fix_idioms": ["sort", "type", "while"],
+    "lib2to3.fixes.fix_intern": ["intern"],
+    "lib2to3.fixes.fix_isinstance": ["isinstance"],
+    "lib2to3.fixes.fix_itertools": [
+        "ifilter",
+        "ifilterfalse",
+        "imap",
+        "izip",
+        "izip_longest",
+    ],
+    "lib2to3.fixes.fix_itertools_imports": ["itertools"],
+    "lib2to3.fixes.fix_long": ["long"],
+    "lib2to3.fixes.fix_map": ["map"],
+    "lib2to3.fixes.fix_methodattrs": ["im_class", "im_func", "im_self"],
+    "lib2to3.fixes.fix_ne": ["<>"],
+    "lib2to3.fixes.fix_next": ["next"],
+    "lib2to3.fixes.fix_nonzero": ["__nonzero__"],
+    "lib2to3.fixes.fix_numliterals": ["0L"],
+    "lib2to3.fixes.fix_operator": [
+        "irepeat",
+        "isCallable",
+        "isMappingType",
+        "isNumberType",
+        "isSequenceType",
+        "repeat",
+        "sequenceIncludes",
+    ],
+    "lib2to3.fixes.fix_paren": ["for"],
+    "lib2to3.fixes.fix_raw_input": ["raw_input"],
+    "lib2to3.fixes.fix_reduce": ["reduce"],
+    "lib2to3.fixes.fix_renames": ["maxint"],
+    "lib2to3.fixes.fix_repr": ["`"],
+    "lib2to3.fixes.fix_standarderror": ["StandardError"],
+    "lib2to3.fixes.fix_sys_exc": ["exc_traceback", "exc_type", "exc_value"],
+    "lib2to3.fixes.fix_throw": ["throw"],
+    "lib2to3.fixes.fix_tuple_params": ["def", "lambda"],
+    "lib2to3.fixes.fix_types": ["types"],
+    "lib2to3.fixes.fix_xreadlines": ["xreadlines"],
+    "lib2to3.fixes.fix_zip": ["zip"],
+    "libfuturize.fixes.fix_basestring": ["basestring"],
+    "libfuturize.fixes.fix_cmp": ["cmp"],
+    "libfuturize.fixes.fix_division_safe": ["/"],
+    "libfuturize.fixes.fix_execfile": ["execfile"],
+    "libfuturize.fixes.fix_future_builtins": [
+        "ascii",
+        "bytes",
+        "chr",
+        "filter",
+        "hex",
+        "input",
+        "map",
+        "next",
+        "oct",
+        "range",
+        "raw_input",
+        "str",
+        "zip",
+    ],
+    "libfuturize.fixes.fix_input": ["input"],
+    "libfuturize.fixes.fix_metaclass": ["__metaclass__"],
+    "libfuturize.fixes.fix_next_call": ["next"],
+    "libfuturize.fixes.fix_object": ["object"],
+    "libfuturize.fixes.fix_print_with_import": ["print"],
+    "libfuturize.fixes.fix_raise": ["raise"],
+    "libfuturize.fixes.fix_unicode_keep_u": ["unichr", "unicode"],
+    "libfuturize.fixes.fix_xrange_with_import": ["range", "xrange"],
+    "libpasteurize.fixes.fix_newstyle": ["class"],
+}
+
+# The names in the patterns of the fixers which only match next to one of the tokens of
+# the fixer, e.g. the keywords of the statements of the fixer, and are too common to be
+# added to its tokens
+FIXER_CONTEXT_NAMES = {
+    "lib2to3.fixes.fix_except": ["else", "finally", "try"],
+    "lib2to3.fixes.fix_exec": ["in"],
+    "lib2to3.fixes.fix_exitfunc": ["import", "sys"],
+    "lib2to3.fixes.fix_filter": ["None", "lambda"],
+    "lib2to3.fixes.fix_getcwdu": ["os"],
+    "lib2to3.fixes.fix_has_key": ["not"],
+    "lib2to3.fixes.fix_idioms": ["is", "list", "not"],
+    "lib2to3.fixes.fix_itertools_imports": ["from", "import"],
+    "lib2to3.fixes.fix_map": ["None", "lambda"],
+    "lib2to3.fixes.fix_next": ["class", "def", "global"],
+    "lib2to3.fixes.fix_nonzero": ["class", "def"],
+    "lib2to3.fixes.fix_paren": ["in"],
+    "lib2to3.fixes.fix_renames": ["as", "from", "import", "sys"],
+    "lib2to3.fixes.fix_sys_exc": ["sys"],
+    "libfuturize.fixes.fix_next_call": ["global"],
+    "libfuturize.fixes.fix_object": ["class"],
+}
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|`|<>|/")
+
+# The string literals of a pattern of lib2to3, quoted by single or double quotes
+LITERAL_PATTERN = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+# The number literals of Python 2 only, the octal ones and the long ones, are indexed as
+# the pseudo token 0L
+NUMBER_PATTERN = re.compile(r"\b(?:0[0-9]|[0-9][0-9A-Za-z_.]*[lL]\b)")
+
+
+def index_tokens(source):
+    # type: (str) -> set
+    """Get the names and the operators which appear anywhere in the source."""
+    tokens = set(TOKEN_PATTERN.findall(source))
+    if NUMBER_PATTERN.search(source):
+        tokens.add("0L")
+    return tokens
+
+
+def get_fixer_tokens(fix, tool):
+    # type: (str, refactor.RefactoringTool) -> Optional[set]
+    """
+    Get the tokens of the fixer, or None if it is run over every file.
+
+    The names and the operators in the pattern of the fixer are added to its listed
+    tokens, except the ones which only match next to them, so the listed tokens cannot
+    miss a name added to the pattern by another version of the fixer.
+    """
+    if fix not in FIXER_TOKENS:
+        return None
+    tokens = set(FIXER_TOKENS[fix])
+    context = set(FIXER_CONTEXT_NAMES.get(fix, []))
+    for fixer in tool.pre_order + tool.post_order:
+        for single, double in LITERAL_PATTERN.findall(fixer.PATTERN or ""):
+            literal = single or double
+            match = TOKEN_PATTERN.match(literal)
+            if match and match.end() == len(literal) and literal not in context:
+                tokens.add(literal)
+    return tokens
+
+
+def can_change(required, tokens):
+    # type: (Optional[set], set) -> bool
+    """Check if the fixer of the required tokens can change a file of the tokens."""
+    return required is None or not tokens.isdisjoint(required)
+
+
+def iter_files(paths):
+    # type: (list) -> object
+    """Yield the Python files in the same order as ``RefactoringTool.refactor``."""
+    py_ext = os.extsep + "py"
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            filenames.sort()
+            for name in filenames:
+                if not name.startswith(".") and os.path.splitext(name)[1] == py_ext:
+                    yield os.path.join(dirpath, name)
+            dirnames[:] = [dn for dn in dirnames if not dn.startswith(".")]
+
+
+def parse(tool, source):
+    # type: (refactor.RefactoringTool, str) -> object
+    """Parse the source the same way as ``RefactoringTool.refactor_string``."""
+    features = refactor._detect_future_features(  # pylint: disable=protected-access
+        source
+    )
+    if "print_function" in features:
+        tool.driver.grammar = pygram.python_grammar_no_print_statement
+    try:
+        tree = tool.driver.parse_string(source)
+    finally:
+        tool.driver.grammar = tool.grammar
+    tree.future_features = features
+    return tree
+
+
+class Analyzer(object):
+    """
+    The analyzer holding the refactoring tools of the fixers.
+
+    The grammar is loaded once by lib2to3, and the tool of every fixer is created once
+    and reused for all payloads run by the same analyzer.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.base = refactor.RefactoringTool([], {})
+        self.tools = {}  # type: dict
+        self.tokens = {}  # type: dict
+
+    def get_tool(self, fix):
+        # type: (str) -> refactor.RefactoringTool
+        """Get the refactoring tool of the fixer, and its tokens."""
+        if fix not in self.tools:
+            self.tools[fix] = refactor.RefactoringTool([fix], {}, [fix])
+            self.tokens[fix] = get_fixer_tokens(fix, self.tools[fix])
+        return self.tools[fix]
+
+    def run(self, payload, emit):
+        # type: (dict, Callable[[dict], None]) -> int
+        """Run the fixers in the payload and emit the diffs."""
+        tools = [(fix, self.get_tool(fix)) for fix in payload["fixes"]]
+        errors = 0
+        routes = []
+        for path in iter_files(payload["paths"]):
+            try:
+                routes.append((path, self.route(path, tools)))
+            except Exception as exc:  # pylint: disable=broad-except
+                errors += 1
+                emit({"type": "error", "path": path, "message": repr(exc)})
+                routes.append((path, []))
+        routed = dict((fix, 0) for fix, _ in tools)
+        for _, route in routes:
+            for fix, _ in route:
+                routed[fix] += 1
+        emit({"type": "routes", "fixes": routed})
+        for path, route in routes:
+            if route:
+                errors += self.run_file(path, route, emit)
+            emit({"type": "progress", "path": path, "fixes": [fix for fix, _ in route]})
+        return int(bool(errors))
+
+    def route(self, path, tools):
+        # type: (str, list) -> list
+        """Get the fixers which can change the file, by the tokens of its source."""
+        # pylint: disable-next=protected-access
+        source, _ = self.base._read_python_source(path)
+        tokens = index_tokens(source)
+        return [
+            (fix, tool) for fix, tool in tools if can_change(self.tokens[fix], tokens)
+        ]
+
+    def run_file(self, path, tools, emit):
+        # type: (str, list, Callable[[dict], None]) -> int
+        """Run the fixers over the file, emit the diffs and return the errors."""
+        try:
+            # pylint: disable-next=protected-access
+            source, _ = self.base._read_python_source(path)
+            tree = parse(self.base, source + "\n")
+        except Exception as exc:  # pylint: disable=broad-except
+            emit({"type": "error", "path": path, "message": repr(exc)})
+            return 1
+        errors = 0
+        for fix, tool in tools:
+            clone = tree.clone()
+            clone.future_features = tree.future_features
+            clone.used_names = tree.used_names
+            try:
+                tool.refactor_tree(clone, path)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors += 1
+                emit({"type": "error", "path": path, "message": repr(exc)})
+                continue
+            if not clone.was_changed:
+                continue
+            refactored = str(clone)[:-1]
+            if refactored == source:
+                continue
+            diff = "".join(line + "\n" for line in diff_texts(source, refactored, path))
+            emit({"type": "diff", "fix": fix, "path": path, "diff": diff})
+        return errors
+
+
+def main(payload, emit):
+    # type: (dict, Callable[[dict], None]) -> int
+    """Run the fixers in the payload and emit the diffs."""
+    return Analyzer().run(payload, emit)
+
+
+def emit_stdout(event):
+    # type: (dict) -> None
+    """Write the event to stdout as a JSON line."""
+    sys.stdout.write(json.dumps(event) + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main(json.load(sys.stdin), emit_stdout))
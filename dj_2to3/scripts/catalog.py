@@ -0,0 +1,56 @@
+"""
+List the fixes of ``libfuturize`` with their docstrings in one call.
+
+This script is executed by the target Python executable, so it must stay compatible
+with both Python 2 and Python 3 and must not import anything from Django.
+
+The payload is read from stdin as a JSON object:
+
+    {"categories": ["lib2to3_fix_names_stage1", ...]}
+
+The events are written to stdout as JSON lines:
+
+    {"type": "fix", "category": "...", "name": "...", "docstring": "..."}
+"""
+
+import json
+import sys
+import warnings
+
+try:
+    from typing import Callable  # pylint: disable=unused-import
+except ImportError:  # Python 2 without the backport of typing
+    pass
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from libfuturize import fixes
+
+
+def main(payload, emit):
+    # type: (dict, Callable[[dict], None]) -> int
+    """Emit every fix of the categories in the payload."""
+    for category in payload["categories"]:
+        for name in getattr(fixes, category):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                module = __import__(name, {}, {}, ["*"])
+            emit(
+                {
+                    "type": "fix",
+                    "category": category,
+                    "name": name,
+                    "docstring": (module.__doc__ or "").strip(),
+                }
+            )
+    return 0
+
+
+def emit_stdout(event):
+    # type: (dict) -> None
+    """Write the event to stdout as a JSON line."""
+    sys.stdout.write(json.dumps(event) + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main(json.load(sys.stdin), emit_stdout))
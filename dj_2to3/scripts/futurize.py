@@ -0,0 +1,105 @@
+"""
+Run the command ``futurize`` with the given arguments and capture its output.
+
+This script is executed by the target Python executable, so it must stay compatible
+with both Python 2 and Python 3 and must not import anything from Django.
+
+The payload is read from stdin as a JSON object:
+
+    {"args": ["--fix", "lib2to3.fixes.fix_apply", "/path/to/project"]}
+
+The events are written to stdout as JSON lines, the standard output of ``futurize`` in
+chunks as it is printed, so the diff of a big project is never held by this script:
+
+    {"type": "stdout", "data": "..."}
+    {"type": "output", "returncode": 0, "stderr": "..."}
+"""
+
+import json
+import logging
+import sys
+import warnings
+
+try:
+    from typing import Callable  # pylint: disable=unused-import
+except ImportError:  # Python 2 without the backport of typing
+    pass
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from libfuturize.main import main as futurize
+
+CHUNK_SIZE = 1 << 16
+
+
+class ChunkWriter(object):
+    """
+    The standard output of ``futurize``, emitted in chunks as it is written.
+
+    The original standard output is restored while a chunk is emitted, because the
+    events are written to it.
+    """
+
+    def __init__(self, emit, stdout):
+        # type: (Callable[[dict], None], object) -> None
+        self.emit = emit
+        self.stdout = stdout
+        self.chunks = []  # type: list
+        self.size = 0
+
+    def write(self, data):
+        # type: (str) -> None
+        """Buffer the data, and emit the buffer once it is big enough."""
+        self.chunks.append(data)
+        self.size += len(data)
+        if self.size >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        # type: () -> None
+        """Emit the buffer as a chunk."""
+        if not self.chunks:
+            return
+        data = "".join(self.chunks)
+        self.chunks, self.size = [], 0
+        writer, sys.stdout = sys.stdout, self.stdout
+        try:
+            self.emit({"type": "stdout", "data": data})
+        finally:
+            sys.stdout = writer
+
+
+def main(payload, emit):
+    # type: (dict, Callable[[dict], None]) -> int
+    """Run ``futurize`` with the arguments in the payload and emit its output."""
+    stdout, stderr = sys.stdout, sys.stderr
+    handlers = logging.root.handlers[:]
+    writer = ChunkWriter(emit, stdout)
+    sys.stdout, sys.stderr = writer, StringIO()
+    try:
+        try:
+            returncode = futurize(payload["args"])
+        except SystemExit as exc:
+            returncode = exc.code if isinstance(exc.code, int) else 1
+        writer.flush()
+        error = sys.stderr.getvalue()
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+        logging.root.handlers[:] = handlers
+    emit({"type": "output", "returncode": returncode or 0, "stderr": error})
+    return 0
+
+
+def emit_stdout(event):
+    # type: (dict) -> None
+    """Write the event to stdout as a JSON line."""
+    sys.stdout.write(json.dumps(event) + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main(json.load(sys.stdin), emit_stdout))
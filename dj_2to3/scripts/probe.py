@@ -0,0 +1,117 @@
+"""
+Probe the environment of the Python executable in one call.
+
+This script is executed by the target Python executable, so it must stay compatible
+with both Python 2 and Python 3 and must not import anything from Django.
+
+The payload is read from stdin as a JSON object:
+
+    {"packages": ["future", "six", ...]}
+
+The event is written to stdout as a JSON line:
+
+    {
+        "type": "environment",
+        "version": "2.7.18",
+        "future": "1.0.0",
+        "packages": {"future": true, "six": false, ...},
+        "site_packages": ["/path/to/lib/python2.7/site-packages", ...],
+        "distributions": {"future": "1.0.0", ...}
+    }
+"""
+
+import json
+import os
+import platform
+import site
+import sys
+
+try:
+    from typing import Callable  # pylint: disable=unused-import
+except ImportError:  # Python 2 without the backport of typing
+    pass
+
+
+def find_package(package):
+    # type: (str) -> bool
+    """Check if the given package is installed without importing it."""
+    if sys.version_info[0] < 3:
+        import imp  # pylint: disable=import-outside-toplevel,deprecated-module
+
+        try:
+            imp.find_module(package)
+        except ImportError:
+            return False
+        return True
+
+    import importlib.util  # pylint: disable=import-outside-toplevel
+
+    return importlib.util.find_spec(package) is not None
+
+
+def get_site_packages():
+    # type: () -> list
+    """Get the existing site-packages directories of this Python executable."""
+    if hasattr(site, "getsitepackages"):
+        paths = list(site.getsitepackages())
+    else:
+        # The site module of the old virtualenv has no getsitepackages
+        paths = [
+            path
+            for path in sys.path
+            if os.path.basename(path) in ("site-packages", "dist-packages")
+        ]
+    if hasattr(site, "getusersitepackages"):
+        paths.append(site.getusersitepackages())
+    return sorted(set(path for path in paths if os.path.isdir(path)))
+
+
+def get_distributions():
+    # type: () -> dict
+    """Get the names and versions of the installed distributions."""
+    try:
+        from importlib import metadata  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        import pkg_resources  # pylint: disable=import-outside-toplevel
+
+        return dict(
+            (dist.project_name.lower(), dist.version)
+            for dist in pkg_resources.working_set
+        )
+    return dict(
+        (dist.metadata["Name"].lower(), dist.version)
+        for dist in metadata.distributions()
+        if dist.metadata["Name"]
+    )
+
+
+def main(payload, emit):
+    # type: (dict, Callable[[dict], None]) -> int
+    """Emit the version and the installed packages of this Python executable."""
+    packages = dict((package, find_package(package)) for package in payload["packages"])
+    future = None
+    if packages.get("future"):
+        import future as future_  # pylint: disable=import-outside-toplevel
+
+        future = future_.__version__
+    emit(
+        {
+            "type": "environment",
+            "version": platform.python_version(),
+            "future": future,
+            "packages": packages,
+            "site_packages": get_site_packages(),
+            "distributions": get_distributions(),
+        }
+    )
+    return 0
+
+
+def emit_stdout(event):
+    # type: (dict) -> None
+    """Write the event to stdout as a JSON line."""
+    sys.stdout.write(json.dumps(event) + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main(json.load(sys.stdin), emit_stdout))
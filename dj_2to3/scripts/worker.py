@@ -0,0 +1,147 @@
+"""
+Serve the jobs of the scripts of this application from one warm process.
+
+This script is executed by the target Python executable, so it must stay compatible
+with both Python 2 and Python 3 and must not import anything from Django.
+
+The scripts, lib2to3, libfuturize and their fixers are loaded once at start. Every
+job is read from stdin as a JSON line:
+
+    {"script": "analyze", "payload": {...}}
+
+and run by a child forked from the warm process, so a job never sees the state left by
+another one. The events of the job are written to stdout as JSON lines, the same as
+the ones of the script run alone, followed by:
+
+    {"type": "exit", "returncode": 0, "stderr": "..."}
+
+The worker exits at the end of stdin, or when no job is read within the idle timeout in
+seconds given as the first argument.
+"""
+
+import json
+import os
+import select
+import sys
+import traceback
+import warnings
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+SCRIPTS = ["analyze", "catalog", "futurize", "probe"]
+
+FIXER_PACKAGES = ["lib2to3.fixes", "libfuturize.fixes", "libpasteurize.fixes"]
+
+
+def preload():
+    # type: () -> dict
+    """
+    Get the entry points of the scripts available to this Python executable.
+
+    The analyzer of the script analyze is created with the tools of all fixers already,
+    so a forked child only has to run them.
+    """
+    handlers = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name in SCRIPTS:
+            try:
+                handlers[name] = __import__(name).main
+            except ImportError:
+                continue
+        if "analyze" in handlers:
+            analyze = sys.modules["analyze"]
+            analyzer = analyze.Analyzer()
+            for package in FIXER_PACKAGES:
+                try:
+                    fixers = analyze.refactor.get_fixers_from_package(package)
+                except ImportError:
+                    continue
+                for fixer in fixers:
+                    try:
+                        analyzer.get_tool(fixer)
+                    except Exception:  # pylint: disable=broad-except
+                        continue
+            handlers["analyze"] = analyzer.run
+    return handlers
+
+
+def run_job(handlers, job):
+    # type: (dict, dict) -> tuple
+    """Run the job and return its return code and its standard error."""
+    stderr, sys.stderr = sys.stderr, StringIO()
+    try:
+        try:
+            returncode = handlers[job["script"]](job["payload"], emit_stdout)
+        except SystemExit as exc:
+            returncode = exc.code if isinstance(exc.code, int) else 1
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc()
+            returncode = 1
+        return returncode or 0, sys.stderr.getvalue()
+    finally:
+        sys.stderr = stderr
+
+
+def serve(handlers, job):
+    # type: (dict, dict) -> None
+    """Run the job in a forked child, or in this process if it cannot fork."""
+    if not hasattr(os, "fork"):
+        returncode, stderr = run_job(handlers, job)
+    else:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:
+            os.close(read_fd)
+            try:
+                result = json.dumps(run_job(handlers, job)).encode("utf-8")
+                sys.stdout.flush()
+                while result:
+                    result = result[os.write(write_fd, result) :]
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+        os.close(write_fd)
+        chunks = []
+        while True:
+            chunk = os.read(read_fd, 1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.close(read_fd)
+        _, status = os.waitpid(pid, 0)
+        try:
+            returncode, stderr = json.loads(b"".join(chunks).decode("utf-8"))
+        except ValueError:
+            if os.WIFSIGNALED(status):
+                returncode = -os.WTERMSIG(status)
+            else:
+                returncode = os.WEXITSTATUS(status) or 1
+            stderr = "The job is terminated abnormally.\n"
+    emit_stdout({"type": "exit", "returncode": returncode, "stderr": stderr})
+
+
+def main(idle_timeout):
+    # type: (float) -> int
+    """Serve the jobs read from stdin until its end or the idle timeout."""
+    handlers = preload()
+    while True:
+        if idle_timeout and not select.select([sys.stdin], [], [], idle_timeout)[0]:
+            return 0
+        line = sys.stdin.readline()
+        if not line:
+            return 0
+        serve(handlers, json.loads(line))
+
+
+def emit_stdout(event):
+    # type: (dict) -> None
+    """Write the event to stdout as a JSON line."""
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else 0))
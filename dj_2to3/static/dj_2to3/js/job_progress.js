@@ -0,0 +1,44 @@
+"use strict";
+{
+    const formatSeconds = (seconds) => {
+        if (seconds === null) {
+            return "-";
+        }
+        const minutes = Math.floor(seconds / 60);
+        return `${minutes}:${String(Math.round(seconds % 60)).padStart(2, "0")}`;
+    };
+
+    const render = (fieldset, progress) => {
+        fieldset.querySelector("progress").value = progress.total ? progress.done / progress.total : 0;
+        fieldset.querySelector("[data-job-status]").textContent =
+            `${progress.status_display}: ${progress.done} / ${progress.total} files, ` +
+            `elapsed ${formatSeconds(progress.elapsed)}, ETA ${formatSeconds(progress.eta)}`;
+        fieldset.querySelector("[data-job-path]").textContent = progress.path;
+        fieldset.querySelector("[data-job-fixes]").replaceChildren(
+            ...Object.entries(progress.fixes).map(([fix, {done, total}]) => {
+                const row = document.createElement("tr");
+                for (const text of [fix, `${done} / ${total} files`]) {
+                    row.appendChild(document.createElement("td")).textContent = text;
+                }
+                return row;
+            }),
+        );
+    };
+
+    window.addEventListener("load", () => {
+        for (const fieldset of document.querySelectorAll("[data-job-events-url]")) {
+            const source = new EventSource(fieldset.dataset.jobEventsUrl);
+            source.addEventListener("message", (event) => {
+                const progress = JSON.parse(event.data);
+                render(fieldset, progress);
+                if (progress.status === "succeeded" || progress.status === "failed") {
+                    source.close();
+                    if (progress.status === "succeeded") {
+                        window.location.reload();
+                    }
+                }
+            });
+            source.addEventListener("error", () => source.close());
+        }
+    });
+}
@@ -0,0 +1,24 @@
+"use strict";
+{
+    const complete = async (input, datalist) => {
+        const url = new URL(input.dataset.autocompleteUrl, window.location.href);
+        url.searchParams.set("term", input.value);
+        const response = await fetch(url);
+        if (!response.ok) {
+            return;
+        }
+        const { results } = await response.json();
+        datalist.replaceChildren(...results.map((result) => new Option(result.text, result.id)));
+    };
+
+    window.addEventListener("load", () => {
+        for (const input of document.querySelectorAll("input[data-autocomplete-url]")) {
+            const datalist = document.getElementById(input.getAttribute("list"));
+            let timer;
+            input.addEventListener("input", () => {
+                clearTimeout(timer);
+                timer = setTimeout(() => complete(input, datalist), 250);
+            });
+        }
+    });
+}
@@ -0,0 +1,24 @@
+"""The template tags about the jobs."""
+
+from typing import Any
+
+from django import template
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model
+
+from ..models import Job
+
+register = template.Library()
+
+
+@register.inclusion_tag("dj_2to3/admin/job_progress.html")
+def job_progress(obj: Model | None) -> dict[str, Any]:
+    """Show the live progress of the pending and running jobs of the object."""
+    if obj is None or obj.pk is None:
+        return {"jobs": []}
+    jobs = Job.objects.filter(
+        content_type=ContentType.objects.get_for_model(obj),
+        object_id=str(obj.pk),
+        status__in=[Job.Status.PENDING, Job.Status.RUNNING],
+    ).order_by("created")
+    return {"jobs": list(jobs)}
@@ -0,0 +1,61 @@
+"""The tests of the analysis of the projects in a single pass."""
+
+import os
+import sys
+import tempfile
+
+from django.test import TransactionTestCase, override_settings
+
+from ..models import Project, PythonExecutable
+from ..utils import close_workers
+
+CORPUS = {
+    "a.py": "import sys\nprint 'a', sys.argv\nd = {}\nif d.has_key('a'):\n    pass\n",
+    "b.py": "from itertools import izip_longest\nx = izip_longest([1], [2])\n",
+    "c.py": "def f(x):\n    return apply(f, (x,))\nraw_input()\n",
+    "clean.py": "x = 1\n",
+    "pkg/__init__.py": "",
+    "pkg/d.py": "class A:\n    def next(self):\n        return 1L\nexec 'x = 1'\n",
+    "pkg/e.py": "try:\n    pass\nexcept Exception, e:\n    raise ValueError, 'e'\n",
+}
+
+
+class SinglePassTest(TransactionTestCase):
+    """The tests of the single pass analysis against one futurize per fix."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            DJ_2TO3_BLOB_DIR=os.path.join(directory.name, "blobs"),
+            DJ_2TO3_CACHE_DIR=os.path.join(directory.name, "cache"),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(close_workers, sys.executable)
+        root = os.path.join(directory.name, "project")
+        for name, content in CORPUS.items():
+            os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+            with open(os.path.join(root, name), "w", encoding="utf-8") as file:
+                file.write(content)
+        python_executable = PythonExecutable.objects.create(path=sys.executable)
+        if not python_executable.future:
+            self.skipTest("The future package is not installed.")
+        python_executable.future.load_fixes()
+        self.project = Project.objects.create(
+            path=root, python_executable=python_executable
+        )
+
+    def test_prefilter(self) -> None:
+        """The fixers skipped by the prefilter miss no diff of futurize."""
+        single_pass = {
+            project_fix.fix.name: project_fix.diff
+            for project_fix in self.project.analyze_future(incremental=False)
+        }
+        per_fix = {
+            project_fix.fix.name: project_fix.diff
+            for project_fix in self.project.analyze_future(single_pass=False)
+        }
+        self.assertIn("lib2to3.fixes.fix_itertools", per_fix)
+        self.assertIn("izip_longest", per_fix["lib2to3.fixes.fix_itertools"])
+        self.assertEqual(single_pass, per_fix)
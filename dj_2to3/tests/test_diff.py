@@ -0,0 +1,69 @@
+"""The tests of the utilities about the unified diffs."""
+
+from django.test import SimpleTestCase
+
+from ..utils import index_diff, join_diff, merge_diff, split_diff
+
+
+def make_fragment(path: str, removed: str, added: str) -> str:
+    """Make the diff of a file changing its first line, as printed by futurize."""
+    return (
+        f"--- {path}\t(original)\n"
+        f"+++ {path}\t(refactored)\n"
+        "@@ -1,2 +1,2 @@\n"
+        f"-{removed}\n"
+        f"+{added}\n"
+        " pass\n"
+    )
+
+
+class SplitDiffTest(SimpleTestCase):
+    """The tests of split_diff and join_diff."""
+
+    def test_split_join(self) -> None:
+        """The diff of a project is split into its files and joined back."""
+        fragments = {
+            "/p/a.py": make_fragment("/p/a.py", "print 1", "print(1)"),
+            "/p/z.py": make_fragment("/p/z.py", "print 2", "print(2)"),
+            "/p/b/c.py": make_fragment("/p/b/c.py", "print 3", "print(3)"),
+        }
+        diff = join_diff(fragments)
+        self.assertEqual(split_diff(diff), fragments)
+        self.assertEqual(list(split_diff(diff)), ["/p/a.py", "/p/z.py", "/p/b/c.py"])
+
+    def test_split_header_lookalike(self) -> None:
+        """A removed and an added line looking like the file headers stay in the hunk."""
+        fragment = make_fragment("/p/a.py", "-- x", "++ y")
+        self.assertIn("\n--- x\n+++ y\n", fragment)
+        self.assertEqual(split_diff(fragment), {"/p/a.py": fragment})
+
+    def test_index(self) -> None:
+        """The lines and the hunks of the diff of a file are counted."""
+        fragment = make_fragment("/p/a.py", "print 1", "print(1)")
+        added, removed, hunks = index_diff(fragment)
+        self.assertEqual((added, removed), (1, 1))
+        self.assertEqual(hunks, [[fragment.index("@@"), 1, 2, 1, 2]])
+
+
+class MergeDiffTest(SimpleTestCase):
+    """The tests of merge_diff."""
+
+    def test_merge(self) -> None:
+        """The diffs of the paths are replaced, added or dropped, the others kept."""
+        kept = make_fragment("/p/a.py", "print 1", "print(1)")
+        changed = make_fragment("/p/b.py", "print 2", "print(2)")
+        dropped = make_fragment("/p/c.py", "print 3", "print(3)")
+        diff = join_diff({"/p/a.py": kept, "/p/b.py": changed, "/p/c.py": dropped})
+        new = make_fragment("/p/b.py", "exec 'x'", "exec('x')")
+        added = make_fragment("/p/d/e.py", "print 4", "print(4)")
+        merged = merge_diff(
+            diff,
+            {"/p/b.py": new, "/p/d/e.py": added},
+            ["/p/b.py", "/p/c.py", "/p/d/e.py"],
+        )
+        self.assertEqual(merged, kept + new + added)
+
+    def test_merge_nothing(self) -> None:
+        """The diff is unchanged if no path is analyzed again."""
+        diff = make_fragment("/p/a.py", "print 1", "print(1)")
+        self.assertEqual(merge_diff(diff, {}, []), diff)
@@ -0,0 +1,80 @@
+"""The tests of the compressed text field."""
+
+import tempfile
+import zlib
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from ..models import Fix, Future, Project, ProjectFix, ProjectFixFile
+from ..utils import join_diff, read_blob, split_diff
+from .test_diff import make_fragment
+
+
+class CompressedTextFieldTest(TestCase):
+    """The tests of the diffs of the project fixes, compressed or in the blob store."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            DJ_2TO3_BLOB_DIR=directory.name, DJ_2TO3_BLOB_THRESHOLD=200
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.project = Project.objects.create(path=directory.name)
+        future = Future.objects.create(version="1.0.0")
+        self.fix = Fix.objects.create(
+            name="lib2to3.fixes.fix_print", docstring="", category="", future=future
+        )
+
+    def get_column(self, project_fix: ProjectFix) -> str:
+        """Get the diff stored compressed in the column of the project fix."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT diff FROM {ProjectFix._meta.db_table} WHERE id = %s",
+                [project_fix.pk],
+            )
+            return zlib.decompress(cursor.fetchone()[0]).decode()
+
+    def test_compressed(self) -> None:
+        """A small diff is stored compressed in the column."""
+        diff = make_fragment("/p/a.py", "print 1", "print(1)")
+        project_fix = ProjectFix.objects.create(
+            project=self.project, fix=self.fix, diff=diff
+        )
+        self.assertEqual(project_fix.diff_blob, "")
+        self.assertEqual(self.get_column(project_fix), diff)
+        self.assertEqual(ProjectFix.objects.get(pk=project_fix.pk).diff, diff)
+
+    def test_blob(self) -> None:
+        """A big diff is stored in the blob store, and its files are read out of it."""
+        fragments = {
+            f"/p/m{i}.py": make_fragment(f"/p/m{i}.py", f"print {i}", f"print({i})")
+            for i in range(10)
+        }
+        diff = join_diff(fragments)
+        (project_fix,) = ProjectFix.upsert(
+            [ProjectFix(project=self.project, fix=self.fix, diff=diff)]
+        )
+        self.assertNotEqual(project_fix.diff_blob, "")
+        self.assertEqual(read_blob(project_fix.diff_blob).decode(), diff)
+        self.assertEqual(self.get_column(project_fix), "")
+
+        loaded = ProjectFix.objects.get(pk=project_fix.pk)
+        self.assertEqual(loaded.diff, diff)
+        files = {
+            file.path: file.read_diff()
+            for file in ProjectFixFile.objects.filter(project_fix=loaded)
+        }
+        self.assertEqual(files, split_diff(diff))
+
+    def test_unchanged(self) -> None:
+        """A diff loaded and saved again unchanged is kept."""
+        diff = make_fragment("/p/a.py", "print 1", "print(1)")
+        project_fix = ProjectFix.objects.create(
+            project=self.project, fix=self.fix, diff=diff
+        )
+        loaded = ProjectFix.objects.get(pk=project_fix.pk)
+        loaded.save()
+        self.assertEqual(ProjectFix.objects.get(pk=project_fix.pk).diff, diff)
@@ -0,0 +1,92 @@
+"""The tests of the patch engine."""
+
+import difflib
+import hashlib
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from ..utils import PatchError, index_diff, patch_file, patch_text
+
+ORIGINAL = "import sys\nprint 'a'\n" + "\n" * 8 + "x = 1\nprint 'b'\n"
+REFACTORED = "import sys\nprint('a')\n" + "\n" * 8 + "x = 1\nprint('b')\n"
+
+
+def make_diff(path: str, original: str, refactored: str) -> str:
+    """Make the diff of a file the same way as futurize."""
+    lines = difflib.unified_diff(
+        original.splitlines(),
+        refactored.splitlines(),
+        path,
+        path,
+        "(original)",
+        "(refactored)",
+        lineterm="",
+    )
+    return "".join(line + "\n" for line in lines)
+
+
+class PatchTextTest(SimpleTestCase):
+    """The tests of patch_text."""
+
+    def setUp(self) -> None:
+        self.diff = make_diff("a.py", ORIGINAL, REFACTORED)
+        self.hunks = index_diff(self.diff)[2]
+
+    def test_patch(self) -> None:
+        """All hunks are applied."""
+        self.assertEqual(len(self.hunks), 2)
+        self.assertEqual(patch_text(ORIGINAL, self.diff, self.hunks), REFACTORED)
+
+    def test_patch_selected(self) -> None:
+        """Only the selected hunks are applied."""
+        self.assertEqual(
+            patch_text(ORIGINAL, self.diff, self.hunks, {1}),
+            ORIGINAL.replace("print 'b'", "print('b')"),
+        )
+
+    def test_stale(self) -> None:
+        """A content changed since the diff was made is not patched."""
+        with self.assertRaises(PatchError):
+            patch_text(
+                ORIGINAL.replace("print 'a'", "print 'c'"), self.diff, self.hunks
+            )
+
+    def test_stale_patched(self) -> None:
+        """A content already patched is not patched again."""
+        with self.assertRaises(PatchError):
+            patch_text(REFACTORED, self.diff, self.hunks)
+
+
+class PatchFileTest(SimpleTestCase):
+    """The tests of patch_file."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "a.py")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(ORIGINAL)
+        self.sha256 = hashlib.sha256(ORIGINAL.encode()).hexdigest()
+        self.diff = make_diff(self.path, ORIGINAL, REFACTORED)
+        self.hunks = index_diff(self.diff)[2]
+
+    def test_patch(self) -> None:
+        """The file unchanged since it was analyzed is patched."""
+        self.assertEqual(
+            patch_file(self.path, self.diff, self.hunks, self.sha256),
+            REFACTORED.encode(),
+        )
+
+    def test_stale(self) -> None:
+        """The file changed since it was analyzed is not patched, even by one hunk."""
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("y = 2\n")
+        with self.assertRaises(PatchError):
+            patch_file(self.path, self.diff, self.hunks, self.sha256)
+
+    def test_not_hashed(self) -> None:
+        """The file whose content was not hashed is not patched."""
+        with self.assertRaises(PatchError):
+            patch_file(self.path, self.diff, self.hunks, "")
@@ -0,0 +1,11 @@
+"""The URL configuration of this application."""
+
+from django.urls import path
+
+from . import views
+
+app_name = "dj_2to3"
+
+urlpatterns = [
+    path("jobs/<int:pk>/events/", views.job_events, name="job_events"),
+]
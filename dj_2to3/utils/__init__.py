@@ -0,0 +1,71 @@
+"""All utilities in this application."""
+
+from .blobs import collect_blobs, put_blob, read_blob
+from .cache import FragmentCache, hash_file
+from .catalog import read_catalog, write_catalog
+from .diff import index_diff, join_diff, merge_diff, split_diff, walk_sort_key
+from .discovery import discover_pythons
+from .engine import analyze_in_process, is_in_process_compatible
+from .files import (
+    atomic_write,
+    is_python_source,
+    iter_python_sources,
+    match_globs,
+    shard_files,
+)
+from .patch import PatchError, patch_file, patch_text, write_patched
+from .pool import get_workers, run_in_pool
+from .progress import Progress
+from .repository import (
+    detect_git_repository,
+    list_changed_files,
+    list_repository_files,
+)
+from .runner import run_async
+from .spool import (
+    SpooledFragments,
+    iter_events,
+    iter_spooled_events,
+    open_spool,
+)
+from .worker import close_workers, run_in_worker
+
+__all__ = [
+    "FragmentCache",
+    "PatchError",
+    "Progress",
+    "SpooledFragments",
+    "analyze_in_process",
+    "atomic_write",
+    "close_workers",
+    "collect_blobs",
+    "detect_git_repository",
+    "discover_pythons",
+    "get_workers",
+    "hash_file",
+    "index_diff",
+    "is_in_process_compatible",
+    "is_python_source",
+    "iter_events",
+    "iter_python_sources",
+    "iter_spooled_events",
+    "join_diff",
+    "list_changed_files",
+    "list_repository_files",
+    "match_globs",
+    "merge_diff",
+    "open_spool",
+    "patch_file",
+    "patch_text",
+    "put_blob",
+    "read_blob",
+    "read_catalog",
+    "run_async",
+    "run_in_pool",
+    "run_in_worker",
+    "shard_files",
+    "split_diff",
+    "walk_sort_key",
+    "write_catalog",
+    "write_patched",
+]
@@ -0,0 +1,99 @@
+"""
+The content-addressed store of the big blobs, e.g. the diffs of the big project fixes.
+
+A blob is saved once in the directory of the setting DJ_2TO3_BLOB_DIR, whatever the
+number of the rows referencing it, keyed by the sha256 of its content:
+
+    <xx>/<sha256>
+
+A blob is never changed once it is written, so it is read through a memory-mapped file,
+and a slice of it, e.g. the diff of one file of a project fix, is read without loading
+the whole blob. The blobs not referenced any more are deleted by the command gc_blobs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from django.conf import settings
+
+from .files import atomic_write
+
+
+def get_blob_path(sha256: str) -> Path:
+    """Get the path of the blob of the sha256."""
+    return Path(settings.DJ_2TO3_BLOB_DIR) / sha256[:2] / sha256
+
+
+def put_blob(data: bytes) -> str:
+    """
+    Save the blob unless it is already saved, and return its sha256.
+
+    The mtime of a blob already saved is updated, so it is not collected before the
+    new reference to it is committed.
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = get_blob_path(sha256)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        atomic_write(path, data)
+    return sha256
+
+
+def read_blob(sha256: str, offset: int = 0, size: int | None = None) -> bytes:
+    """
+    Read the blob, or only the slice of the size from the offset.
+
+    The blob is memory-mapped, so only the pages of the slice are read from the disk.
+    """
+    with open(get_blob_path(sha256), "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return b""
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[offset : None if size is None else offset + size]
+
+
+def iter_blobs() -> Iterator[tuple[str, float]]:
+    """Yield the sha256 and the mtime of every blob in the store."""
+    for directory in Path(settings.DJ_2TO3_BLOB_DIR).glob("??"):
+        with os.scandir(directory) as scanned:
+            for entry in scanned:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    yield entry.name, entry.stat().st_mtime
+                except OSError:
+                    continue
+
+
+def collect_blobs(
+    referenced: Iterable[str], grace: float = 3600, dry_run: bool = False
+) -> tuple[int, int]:
+    """
+    Delete the blobs not referenced, and return the number and the size of them.
+
+    The blobs younger than the grace period in seconds are kept, because they may be
+    written by a transaction not committed yet.
+    """
+    referenced = set(referenced)
+    deadline = time.time() - grace
+    deleted = size = 0
+    for sha256, mtime in iter_blobs():
+        if sha256 in referenced or mtime > deadline:
+            continue
+        path = get_blob_path(sha256)
+        try:
+            blob_size = path.stat().st_size
+            if not dry_run:
+                path.unlink()
+        except OSError:
+            continue
+        deleted += 1
+        size += blob_size
+    return deleted, size
@@ -0,0 +1,234 @@
+"""
+The on-disk cache of the diffs of the files by the fixes.
+
+The diff of a file by a fix only depends on the content of the file, the fix, the
+version of future and the version of the Python executable, so it is cached in the
+directory of the setting DJ_2TO3_CACHE_DIR, which can be shared between nodes and
+projects:
+
+    fragments/<xx>/<sha256>.json    the diffs of the content by the fixes
+    fragments/stats.json            the hit and miss counters
+
+A cached entry is keyed by the sha256 of the content, the version of future and the
+version of the Python executable, and maps every fix already run over the content to
+its diff without the file headers, or None if the fix changes nothing. The diffs of the
+fixes of the imports also depend on the modules next to the file, so they are cached in
+another entry whose key includes the modules of the directory of the file too. The entries are
+evicted in the least recently used order when the cache is larger than the setting
+DJ_2TO3_FRAGMENT_CACHE_SIZE.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from .files import atomic_write
+from .spool import SpooledFragments
+
+# The fixers whose diff of a file depends on the modules in the directory of the file,
+# see ``FixImport.probably_a_local_import``
+PATH_DEPENDENT_FIXES = frozenset(
+    ["lib2to3.fixes.fix_import", "libfuturize.fixes.fix_absolute_import"]
+)
+
+MODULE_SUFFIXES = (".py", ".pyc", ".so", ".sl", ".pyd", ".pyx")
+
+
+def get_fragments_dir() -> Path:
+    """Get the directory of the cache of the diffs."""
+    return Path(settings.DJ_2TO3_CACHE_DIR) / "fragments"
+
+
+def hash_file(path: str) -> str | None:
+    """Get the sha256 of the content of the file, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def list_modules(directory: str) -> list[str]:
+    """List the names of the modules and the subdirectories of the directory."""
+    try:
+        with os.scandir(directory) as scanned:
+            return sorted(
+                entry.name
+                for entry in scanned
+                if entry.name.endswith(MODULE_SUFFIXES) or entry.is_dir()
+            )
+    except OSError:
+        return []
+
+
+def strip_headers(fragment: str) -> str:
+    """Strip the file headers from the diff of a file."""
+    return fragment.split("\n", 2)[2]
+
+
+def add_headers(body: str, path: str) -> str:
+    """Add the file headers of the path to the diff of a file."""
+    return f"--- {path}\t(original)\n+++ {path}\t(refactored)\n{body}"
+
+
+class FragmentCache:
+    """The cache of the diffs of the files by the fixes."""
+
+    def __init__(self, future_version: str, python_version: str) -> None:
+        self.key = f"{future_version}:{python_version}"
+        self.root = get_fragments_dir()
+        self.hits = 0
+        self.misses = 0
+        self.digests: dict[str, str | None] = {}
+        self.modules: dict[str, list[str]] = {}
+
+    def get_entry_path(self, path: str, local: bool = False) -> Path | None:
+        """
+        Get the path of the entry of the content of the file.
+
+        The entry of the fixes depending on the modules next to the file is keyed by
+        these modules too.
+        """
+        if path not in self.digests:
+            self.digests[path] = hash_file(path)
+        if not (digest := self.digests[path]):
+            return None
+        key = f"{digest}:{self.key}"
+        if local:
+            directory = os.path.dirname(path)
+            if directory not in self.modules:
+                self.modules[directory] = list_modules(directory)
+            key = f"{key}:{json.dumps(self.modules[directory])}"
+        key = hashlib.sha256(key.encode()).hexdigest()
+        return self.root / key[:2] / f"{key}.json"
+
+    def read_entry(self, path: str, fixes: list[str]) -> dict[str, Any]:
+        """Read the cached diffs of the file by the fixes, of both of its entries."""
+        entry: dict[str, Any] = {}
+        for local in (False, True):
+            if not (names := [fix for fix in fixes if self.is_local(fix) == local]):
+                continue
+            if not (entry_path := self.get_entry_path(path, local)):
+                continue
+            try:
+                cached = json.loads(entry_path.read_bytes())
+                os.utime(entry_path)
+            except (OSError, ValueError):
+                continue
+            entry.update((fix, cached[fix]) for fix in names if fix in cached)
+        return entry
+
+    @staticmethod
+    def is_local(fix: str) -> bool:
+        """Check if the diffs of the fix depend on the modules next to the file."""
+        return fix in PATH_DEPENDENT_FIXES
+
+    def lookup(
+        self, paths: Iterable[str], fixes: list[str]
+    ) -> tuple[SpooledFragments, list[str]]:
+        """
+        Look up the diffs of the files by the fixes.
+
+        Return the cached diffs of the files by fix, and the files which have to be run
+        by at least one of the fixes.
+        """
+        fragments = SpooledFragments()
+        missing: list[str] = []
+        for path in paths:
+            entry = self.read_entry(path, fixes)
+            hits = [fix for fix in fixes if fix in entry]
+            self.hits += len(hits)
+            self.misses += len(fixes) - len(hits)
+            if len(hits) < len(fixes):
+                missing.append(path)
+                continue
+            for fix in hits:
+                if (body := entry[fix]) is not None:
+                    fragments.add(fix, path, add_headers(body, path))
+        return fragments, missing
+
+    def store(
+        self,
+        paths: Iterable[str],
+        fixes: list[str],
+        fragments: SpooledFragments,
+    ) -> None:
+        """Store the diffs of the files, all of them run by all of the fixes."""
+        for path in paths:
+            for local in (False, True):
+                if not (names := [fix for fix in fixes if self.is_local(fix) == local]):
+                    continue
+                if not (entry_path := self.get_entry_path(path, local)):
+                    continue
+                entry: dict[str, Any] = {}
+                try:
+                    entry = json.loads(entry_path.read_bytes())
+                except (OSError, ValueError):
+                    pass
+                for fix in names:
+                    fragment = fragments.get(fix).get(path)
+                    entry[fix] = strip_headers(fragment) if fragment else None
+                atomic_write(entry_path, json.dumps(entry).encode())
+
+    def flush(self) -> None:
+        """Add the counters of this cache to the shared counters and evict entries."""
+        update_stats(self.hits, self.misses)
+        self.hits = self.misses = 0
+        evict(settings.DJ_2TO3_FRAGMENT_CACHE_SIZE)
+
+
+def update_stats(hits: int = 0, misses: int = 0) -> dict[str, int]:
+    """Add to the shared hit and miss counters, and return them."""
+    root = get_fragments_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / "stats.lock", "w", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            stats: dict[str, int] = json.loads((root / "stats.json").read_bytes())
+        except (OSError, ValueError):
+            stats = {"hits": 0, "misses": 0}
+        if hits or misses:
+            stats = {"hits": stats["hits"] + hits, "misses": stats["misses"] + misses}
+            atomic_write(root / "stats.json", json.dumps(stats).encode())
+    return stats
+
+
+def evict(max_size: int) -> tuple[int, int]:
+    """
+    Evict the least recently used entries until the cache is not larger than the size.
+
+    Return the number of the evicted entries and the size left.
+    """
+    entries: list[tuple[float, int, str]] = []
+    size = 0
+    for directory in get_fragments_dir().glob("??"):
+        with os.scandir(directory) as scanned:
+            for entry in scanned:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                size += stat.st_size
+    evicted = 0
+    for _, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        size -= entry_size
+        evicted += 1
+    return evicted, size
@@ -0,0 +1,50 @@
+"""
+The on-disk cache of the fix catalogs.
+
+The catalog of a future version never changes, so it is cached in the directory of the
+setting DJ_2TO3_CACHE_DIR, which can be shared between nodes:
+
+    catalog/objects/<sha256>.json   the catalog, addressed by the digest of its content
+    catalog/versions/<version>      the digest of the catalog of the future version
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from .files import atomic_write
+
+
+def get_catalog_dir() -> Path:
+    """Get the directory of the catalog cache."""
+    return Path(settings.DJ_2TO3_CACHE_DIR) / "catalog"
+
+
+def read_catalog(version: str) -> list[dict[str, Any]] | None:
+    """Read the cached catalog of the future version, or None if not cached."""
+    catalog_dir = get_catalog_dir()
+    try:
+        digest = (catalog_dir / "versions" / version).read_text().strip()
+        data = (catalog_dir / "objects" / f"{digest}.json").read_bytes()
+    except FileNotFoundError:
+        return None
+    if hashlib.sha256(data).hexdigest() != digest:
+        return None
+    catalog: list[dict[str, Any]] = json.loads(data)
+    return catalog
+
+
+def write_catalog(version: str, catalog: list[dict[str, Any]]) -> str:
+    """Write the catalog of the future version to the cache and return its digest."""
+    catalog_dir = get_catalog_dir()
+    data = json.dumps(catalog, sort_keys=True).encode()
+    digest = hashlib.sha256(data).hexdigest()
+    if not (path := catalog_dir / "objects" / f"{digest}.json").is_file():
+        atomic_write(path, data)
+    atomic_write(catalog_dir / "versions" / version, digest.encode())
+    return digest
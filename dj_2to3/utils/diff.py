@@ -0,0 +1,100 @@
+"""
+The utilities about the unified diffs printed by ``futurize``.
+
+A diff of a project is the concatenation of the diffs of its files, in the order of the
+walk of ``RefactoringTool.refactor_dir``: the files of a directory sorted by name, then
+its subdirectories sorted by name.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import PurePath
+
+HUNK_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def walk_sort_key(path: str) -> tuple[tuple[int, str], ...]:
+    """Get the key to sort the paths in the order of the walk of a directory."""
+    *directories, name = PurePath(path).parts
+    return (*((1, directory) for directory in directories), (0, name))
+
+
+def split_diff(diff: str) -> dict[str, str]:
+    """
+    Split the diff of a project into the diffs of its files.
+
+    The lines of every hunk are counted from its header, so a removed or an added line
+    looking like a file header is never mistaken for one.
+    """
+    fragments: dict[str, list[str]] = {}
+    lines = diff.splitlines(keepends=True)
+    path = ""
+    old = new = 0
+    for i, line in enumerate(lines):
+        if old > 0 or new > 0:
+            if line.startswith((" ", "-")):
+                old -= 1
+            if line.startswith((" ", "+")):
+                new -= 1
+        elif (
+            line.startswith("--- ")
+            and i + 1 < len(lines)
+            and lines[i + 1].startswith("+++ ")
+        ):
+            path = line[4:].rstrip("\n").rsplit("\t", 1)[0]
+        elif match := HUNK_PATTERN.match(line):
+            _, old, _, new = parse_hunk_header(match)
+        fragments.setdefault(path, []).append(line)
+    return {path: "".join(fragment) for path, fragment in fragments.items()}
+
+
+def parse_hunk_header(match: re.Match[str]) -> list[int]:
+    """Get the start and the number of the old lines and the new lines of a hunk."""
+    old_start, old_count, new_start, new_count = match.groups()
+    return [
+        int(old_start),
+        int(1 if old_count is None else old_count),
+        int(new_start),
+        int(1 if new_count is None else new_count),
+    ]
+
+
+def index_diff(fragment: str) -> tuple[int, int, list[list[int]]]:
+    """
+    Count the added and the removed lines of the diff of a file, and index its hunks.
+
+    Every hunk is indexed by the offset in characters of its header in the diff, and
+    the start and the number of its old and new lines.
+    """
+    added = removed = offset = old = new = 0
+    hunks: list[list[int]] = []
+    for line in fragment.splitlines(keepends=True):
+        if old > 0 or new > 0:
+            if line.startswith(("-", " ")):
+                old -= 1
+            if line.startswith(("+", " ")):
+                new -= 1
+            added += line.startswith("+")
+            removed += line.startswith("-")
+        elif match := HUNK_PATTERN.match(line):
+            hunk = parse_hunk_header(match)
+            _, old, _, new = hunk
+            hunks.append([offset, *hunk])
+        offset += len(line)
+    return added, removed, hunks
+
+
+def join_diff(fragments: Mapping[str, str]) -> str:
+    """Join the diffs of the files into the diff of a project in the walk order."""
+    return "".join(fragments[path] for path in sorted(fragments, key=walk_sort_key))
+
+
+def merge_diff(diff: str, fragments: Mapping[str, str], paths: Iterable[str]) -> str:
+    """Replace the diffs of the files of the paths in the diff of a project."""
+    merged = split_diff(diff)
+    for path in paths:
+        merged.pop(path, None)
+    merged.update(fragments)
+    return join_diff(merged)
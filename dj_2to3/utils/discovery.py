@@ -0,0 +1,92 @@
+"""
+The incremental discovery of the Python executables.
+
+The state of a scan maps every visited directory to its mtime, its subdirectories and
+the Python executables in it. A directory whose mtime is not changed since the last
+scan has the same entries, so only its subdirectories are visited again, without
+listing it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from .files import atomic_write
+
+PYTHON_PATTERN = re.compile(r"^python([23]\.[0-9]{,2}){,1}$")
+
+
+def get_state_path(root: str) -> Path:
+    """Get the path of the state of the scans of the root."""
+    digest = hashlib.sha256(root.encode()).hexdigest()
+    return Path(settings.DJ_2TO3_CACHE_DIR) / "discovery" / f"{digest}.json"
+
+
+def read_state(root: str) -> dict[str, Any]:
+    """Read the state of the last scan of the root."""
+    try:
+        state: dict[str, Any] = json.loads(get_state_path(root).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state
+
+
+def write_state(root: str, state: dict[str, Any]) -> None:
+    """Write the state of the last scan of the root."""
+    atomic_write(get_state_path(root), json.dumps(state).encode())
+
+
+def list_directory(directory: str, excludes: set[str]) -> tuple[list[str], list[str]]:
+    """List the subdirectories and the Python executables in the directory."""
+    subdirectories: list[str] = []
+    pythons: list[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in excludes:
+                        subdirectories.append(entry.name)
+                elif (
+                    PYTHON_PATTERN.match(entry.name)
+                    and entry.is_file()
+                    and os.access(entry.path, os.X_OK)
+                ):
+                    pythons.append(entry.name)
+            except OSError:
+                continue
+    return sorted(subdirectories), sorted(pythons)
+
+
+def discover_pythons(root: str, full: bool = False) -> list[str]:
+    """
+    Discover the Python executables under the root.
+
+    Only the directories changed since the last scan are listed again, unless a full
+    scan is requested. The directories in the setting DJ_2TO3_DISCOVERY_EXCLUDES are
+    skipped, and the symbolic links to directories are not followed.
+    """
+    excludes = set(settings.DJ_2TO3_DISCOVERY_EXCLUDES)
+    state = {} if full else read_state(root)
+    new_state: dict[str, Any] = {}
+    pythons: list[str] = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            if (entry := state.get(directory)) is None or entry[0] != mtime:
+                entry = [mtime, *list_directory(directory, excludes)]
+        except OSError:
+            continue
+        new_state[directory] = entry
+        pythons.extend(os.path.join(directory, name) for name in entry[2])
+        stack.extend(os.path.join(directory, name) for name in entry[1])
+    write_state(root, new_state)
+    return sorted(pythons)
@@ -0,0 +1,120 @@
+"""
+The in-process engine to run the fixes by the server itself.
+
+Spawning a Python executable to run the fixes is pure overhead when the server runs the
+same version of Python and of future as the Python executable. In that case the script
+``analyze`` is loaded as a module by the server, so the grammar of lib2to3 is loaded
+once, and the refactoring tools of the fixers are created once per thread and reused by
+all analyses. The diffs are the same as the ones of the script run by the executable.
+
+The engine is not available when lib2to3 or libfuturize cannot be imported by the
+server, e.g. lib2to3 is removed since Python 3.13, or when the setting
+DJ_2TO3_IN_PROCESS is disabled.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import json
+import platform
+import subprocess  # nosec B404
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as get_version
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from django.conf import settings
+
+from .spool import iter_spooled_events, open_spool
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / "scripts" / "analyze.py"
+
+_local = threading.local()
+
+
+@functools.cache
+def load_analyze_script() -> ModuleType | None:
+    """Load the script analyze as a module, or None if its imports are missing."""
+    spec = importlib.util.spec_from_file_location("dj_2to3_analyze", SCRIPT_PATH)
+    if not spec or not spec.loader:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+        importlib.import_module("libfuturize")
+    except ImportError:
+        return None
+    return module
+
+
+@functools.cache
+def get_future_version() -> str | None:
+    """Get the version of future installed for the server."""
+    try:
+        return get_version("future")
+    except PackageNotFoundError:
+        return None
+
+
+def is_in_process_compatible(environment: dict[str, Any]) -> bool:
+    """
+    Check if the fixes can be run in-process for the environment of a Python executable.
+
+    The server must run the same minor version of Python and the same version of future
+    as the Python executable, and be able to load the script analyze.
+    """
+    if not settings.DJ_2TO3_IN_PROCESS or not environment.get("future"):
+        return False
+    major, minor, *_ = platform.python_version_tuple()
+    if environment["version"].split(".")[:2] != [major, minor]:
+        return False
+    if environment["future"] != get_future_version():
+        return False
+    return load_analyze_script() is not None
+
+
+def analyze_in_process(
+    payload: dict[str, Any],
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Run the script analyze in-process and return an iterator of its events.
+
+    The analyzer is created once per thread, because the fixers keep the state of the
+    tree being fixed. Every event is also passed to the callback as soon as it is
+    emitted. The events are spooled the same way as the output of the script run by a
+    Python executable, and only the errors are kept in memory, to be raised the same
+    way as the ones of the script if any file fails.
+    """
+    if not (module := load_analyze_script()):
+        raise RuntimeError("The in-process engine is not available.")
+    if (analyzer := getattr(_local, "analyzer", None)) is None:
+        analyzer = _local.analyzer = module.Analyzer()
+    spool = open_spool()
+    errors: list[dict[str, Any]] = []
+
+    def emit(event: dict[str, Any]) -> None:
+        spool.write(json.dumps(event).encode() + b"\n")
+        if event["type"] == "error":
+            errors.append(event)
+        if on_event:
+            on_event(event)
+
+    try:
+        returncode = analyzer.run(payload, emit)
+    except BaseException:
+        spool.close()
+        raise
+    if returncode:
+        spool.close()
+        raise subprocess.CalledProcessError(
+            returncode,
+            [sys.executable, str(SCRIPT_PATH)],
+            output="".join(json.dumps(event) + "\n" for event in errors),
+        )
+    return iter_spooled_events(spool)
@@ -0,0 +1,104 @@
+"""The utilities about files."""
+
+from __future__ import annotations
+
+import fnmatch
+import heapq
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path, PurePath
+
+from .diff import walk_sort_key
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write the data to the path atomically.
+
+    The data is written to a temporary file in the same directory and then renamed to
+    the path, so a concurrent reader, even on another node sharing the directory, never
+    sees a partially written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(name, path)
+    except BaseException:
+        Path(name).unlink(missing_ok=True)
+        raise
+
+
+def is_python_source(path: str) -> bool:
+    """
+    Check if the relative path is a Python source refactored by ``futurize``.
+
+    The hidden files and the files in the hidden directories are skipped by the walk of
+    ``RefactoringTool.refactor_dir``.
+    """
+    parts = PurePath(path).parts
+    return path.endswith(".py") and not any(part.startswith(".") for part in parts)
+
+
+def match_globs(path: str, include: Iterable[str], exclude: Iterable[str]) -> bool:
+    """
+    Check if the relative path is selected by the globs.
+
+    The path is selected if it matches any of the globs to include, or if there is no
+    glob to include, and does not match any of the globs to exclude. The globs are
+    matched against the whole POSIX path, and ``*`` matches ``/`` too.
+    """
+    path = PurePath(path).as_posix()
+    include = list(include)
+    if include and not any(fnmatch.fnmatchcase(path, glob) for glob in include):
+        return False
+    return not any(fnmatch.fnmatchcase(path, glob) for glob in exclude)
+
+
+def iter_python_sources(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the Python sources of the paths, as ``RefactoringTool.refactor`` walks them.
+
+    The directories are walked with their files and subdirectories sorted by name, the
+    hidden ones skipped, and the files are yielded as they are.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            filenames.sort()
+            for name in filenames:
+                if not name.startswith(".") and os.path.splitext(name)[1] == ".py":
+                    yield os.path.join(dirpath, name)
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+
+
+def shard_files(paths: Iterable[str], shards: int) -> list[list[str]]:
+    """
+    Split the files into at most that many shards balanced by their sizes in bytes.
+
+    The biggest file left is always added to the smallest shard, and the files of every
+    shard are sorted in the walk order. The files which cannot be read count as empty.
+    """
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append((os.path.getsize(path), path))
+        except OSError:
+            sizes.append((0, path))
+    sizes.sort(key=lambda item: (-item[0], walk_sort_key(item[1])))
+    heap: list[tuple[int, int, list[str]]] = [
+        (0, index, []) for index in range(min(max(1, shards), len(sizes)))
+    ]
+    for size, path in sizes:
+        total, index, shard = heapq.heappop(heap)
+        shard.append(path)
+        heapq.heappush(heap, (total + size, index, shard))
+    return [
+        sorted(shard, key=walk_sort_key)
+        for _, _, shard in sorted(heap, key=lambda item: item[1])
+    ]
@@ -0,0 +1,100 @@
+"""
+The patch engine applying the stored diffs of the files.
+
+A diff printed by ``futurize`` is made of the lines of the file split by
+``str.splitlines``, without their line endings, so it is applied exactly only to a file
+whose lines all end with a line feed, the last one optionally. The content of the file
+must also be the one the diff is made from, which is checked by its sha256 before any
+hunk is applied, so a file changed since it was analyzed is never patched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import shutil
+import tokenize
+from collections.abc import Collection
+from pathlib import Path
+
+from .files import atomic_write
+
+
+class PatchError(ValueError):
+    """The diff cannot be applied to the content."""
+
+
+def patch_text(
+    text: str,
+    diff: str,
+    hunks: list[list[int]],
+    selected: Collection[int] | None = None,
+) -> str:
+    """
+    Apply the hunks of the diff of a file to its content.
+
+    The hunks are located by their index in the diff, and only the selected ones by
+    their position are applied if any. The context and the removed lines of every hunk
+    are checked against the content.
+    """
+    lines = text.splitlines()
+    if "\n".join(lines) + ("\n" if text.endswith("\n") else "") != text:
+        raise PatchError("The lines do not all end with a line feed.")
+    patched: list[str] = []
+    position = 0
+    ends = [hunk[0] for hunk in hunks[1:]] + [len(diff)]
+    for i, ((offset, old_start, old_count, _, _), end) in enumerate(zip(hunks, ends)):
+        if selected is not None and i not in selected:
+            continue
+        start = old_start - 1 if old_count else old_start
+        if start < position:
+            raise PatchError(f"The hunk {i} overlaps the previous one.")
+        patched.extend(lines[position:start])
+        position = start
+        for line in diff[offset:end].splitlines()[1:]:
+            tag, content = line[:1], line[1:]
+            if tag in (" ", "-"):
+                if position >= len(lines) or lines[position] != content:
+                    raise PatchError(
+                        f"The hunk {i} does not match line {position + 1}."
+                    )
+                position += 1
+            if tag in (" ", "+"):
+                patched.append(content)
+    patched.extend(lines[position:])
+    return "\n".join(patched) + ("\n" if text.endswith("\n") and patched else "")
+
+
+def patch_file(
+    path: str,
+    diff: str,
+    hunks: list[list[int]],
+    sha256: str,
+    selected: Collection[int] | None = None,
+) -> bytes:
+    """
+    Get the content of the file patched by its diff, the same as written by the fixer.
+
+    The file is decoded by its encoding declaration as ``futurize`` does, and it must
+    not be changed since its diff was made.
+    """
+    data = Path(path).read_bytes()
+    if not sha256 or hashlib.sha256(data).hexdigest() != sha256:
+        raise PatchError("The file is changed since it was analyzed.")
+    encoding = tokenize.detect_encoding(io.BytesIO(data).readline)[0]
+    return patch_text(data.decode(encoding), diff, hunks, selected).encode(encoding)
+
+
+def write_patched(path: str, data: bytes, backup: bool = True) -> None:
+    """
+    Write the patched content of the file atomically, keeping its mode.
+
+    The original file is kept with the suffix ``.bak`` as ``futurize`` does, unless the
+    backup is disabled.
+    """
+    mode = os.stat(path).st_mode
+    if backup:
+        shutil.copy2(path, f"{path}.bak")
+    atomic_write(Path(path), data)
+    os.chmod(path, mode)
@@ -0,0 +1,48 @@
+"""The bounded pool to run the external tools concurrently."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TypeVar
+
+from django.conf import settings
+from django.db import connections
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def get_workers(workers: int | None = None) -> int:
+    """Get the number of workers, the setting DJ_2TO3_WORKERS by default."""
+    return max(1, workers or settings.DJ_2TO3_WORKERS)
+
+
+def run_in_pool(
+    func: Callable[[T], R], items: Iterable[T], workers: int | None = None
+) -> Iterator[tuple[T, R]]:
+    """
+    Run the function over the items in a bounded pool.
+
+    The heavy work of every item is done by an external process, so one thread per
+    running item is enough to keep that many processes busy on their own cores. The
+    results are yielded as soon as they are completed, and the database connections
+    opened by a thread are closed after every item.
+    """
+    items = list(items)
+    workers = min(get_workers(workers), len(items))
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    def call(item: T) -> R:
+        try:
+            return func(item)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(call, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,72 @@
+"""The progress of the analyses by file and by fixer."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+
+class Progress:
+    """
+    The progress of an analysis by file and by fixer.
+
+    The state is the number of the files to analyze, the number of the files already
+    analyzed by all fixers and the last analyzed file. A fixer is only run over the
+    files routed to it by the prefilter, so the progress of every fixer is the number
+    of the files routed to it and the number of them already analyzed. It is reported
+    to the callback at most once per interval, and it can be advanced from many threads.
+    """
+
+    def __init__(
+        self, report: Callable[[dict[str, Any]], None], interval: float = 0.5
+    ) -> None:
+        self.report = report
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.reported = 0.0
+        self.state: dict[str, Any] = {"total": 0, "done": 0, "path": "", "fixes": {}}
+
+    def start(self, total: int) -> None:
+        """Start the analysis of the files."""
+        with self.lock:
+            self.state = {"total": total, "done": 0, "path": "", "fixes": {}}
+            self.flush()
+
+    def route(self, routed: Mapping[str, int]) -> None:
+        """Add the numbers of the files routed to the fixers."""
+        with self.lock:
+            for fix, count in routed.items():
+                state = self.state["fixes"].setdefault(fix, {"total": 0, "done": 0})
+                state["total"] += count
+
+    def advance(
+        self, path: str = "", count: int = 1, fixes: Iterable[str] = ()
+    ) -> None:
+        """Advance by the files, the last one of them analyzed by the fixers is the path."""
+        with self.lock:
+            self.state["done"] += count
+            for fix in fixes:
+                self.state["fixes"][fix]["done"] += 1
+            if path:
+                self.state["path"] = path
+            if time.monotonic() - self.reported >= self.interval:
+                self.flush()
+
+    def finish(self) -> None:
+        """Report the final state of the analysis."""
+        with self.lock:
+            self.flush()
+
+    def flush(self) -> None:
+        """Report a copy of the state, with the lock held to keep the reports in order."""
+        self.reported = time.monotonic()
+        self.report(
+            {
+                **self.state,
+                "fixes": {
+                    fix: dict(state) for fix, state in self.state["fixes"].items()
+                },
+            }
+        )
@@ -0,0 +1,56 @@
+"""The utilities about the git repositories."""
+
+from __future__ import annotations
+
+import git
+
+
+def detect_git_repository(path: str) -> tuple[bool, str]:
+    """Detect whether the path is a git repository, and the sha of its HEAD."""
+    try:
+        repo = git.Repo(path)
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
+        return False, ""
+    with repo:
+        try:
+            return True, repo.head.commit.hexsha
+        except ValueError:
+            # The repository has no commit yet
+            return True, ""
+
+
+def list_changed_files(path: str, since: str) -> set[str] | None:
+    """
+    List the files changed in the working tree since the commit.
+
+    The paths are relative to the repository, and include the deleted and the untracked
+    files. Return None if the path is not a git repository or the commit is unknown.
+    """
+    try:
+        repo = git.Repo(path)
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
+        return None
+    with repo:
+        try:
+            changed = repo.git.diff("--name-only", "--no-renames", "-z", since, "--")
+        except git.exc.GitCommandError:
+            return None
+        untracked = repo.git.ls_files("--others", "--exclude-standard", "-z")
+    return {name for name in f"{changed}\0{untracked}".split("\0") if name}
+
+
+def list_repository_files(path: str) -> list[str] | None:
+    """
+    List the files of the working tree which are not ignored by git.
+
+    They are the tracked files and the untracked ones not excluded by ``.gitignore``,
+    the info/exclude file or the global excludes file, relative to the repository.
+    Return None if the path is not a git repository.
+    """
+    try:
+        repo = git.Repo(path)
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
+        return None
+    with repo:
+        files = repo.git.ls_files("--cached", "--others", "--exclude-standard", "-z")
+    return sorted({name for name in files.split("\0") if name})
@@ -0,0 +1,124 @@
+"""
+The asynchronous runner of the external processes.
+
+All processes run by it in an event loop share one limit of concurrency, the setting
+DJ_2TO3_ASYNC_CONCURRENCY, so one ASGI process can supervise many runs without a thread
+per run. A process is killed when it exceeds its timeout, the setting
+DJ_2TO3_SUBPROCESS_TIMEOUT by default, or when the task awaiting it is cancelled.
+
+The standard output of a process can be copied in chunks into a file, e.g. a spool, as
+it is read, instead of being held in memory until the process exits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess  # nosec B404
+from collections.abc import Sequence
+from typing import IO
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+
+from .spool import CHUNK_SIZE
+
+_semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    WeakKeyDictionary()
+)
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore limiting the processes run concurrently in this event loop."""
+    loop = asyncio.get_running_loop()
+    if (semaphore := _semaphores.get(loop)) is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(
+            max(1, settings.DJ_2TO3_ASYNC_CONCURRENCY)
+        )
+    return semaphore
+
+
+async def run_async(
+    args: Sequence[str],
+    stdin: str | None = None,
+    timeout: float | None = None,
+    check: bool = True,
+    stdout: IO[bytes] | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """
+    Run the command with the text on its standard input, and capture its output.
+
+    It is the asynchronous variant of ``subprocess.run``, raising the same errors when
+    the command fails or times out. If a file is given, the standard output is copied
+    into it instead, and the captured one is None.
+    """
+    timeout = timeout or settings.DJ_2TO3_SUBPROCESS_TIMEOUT or None
+    async with get_semaphore():
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=subprocess.DEVNULL if stdin is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                output, error = await communicate(
+                    process, None if stdin is None else stdin.encode(), stdout
+                )
+        except TimeoutError as exc:
+            await kill(process)
+            raise subprocess.TimeoutExpired(list(args), timeout or 0) from exc
+        except asyncio.CancelledError:
+            await kill(process)
+            raise
+    result = subprocess.CompletedProcess(
+        list(args),
+        process.returncode or 0,
+        None if output is None else output.decode(),
+        error.decode(),
+    )
+    if check:
+        result.check_returncode()
+    return result
+
+
+async def communicate(
+    process: asyncio.subprocess.Process,
+    stdin: bytes | None,
+    stdout: IO[bytes] | None,
+) -> tuple[bytes | None, bytes]:
+    """
+    Communicate with the process until it exits, and return its outputs.
+
+    If a file is given, the standard output is copied into it in chunks as it is read.
+    """
+    if stdout is None:
+        return await process.communicate(stdin)
+    assert process.stdout and process.stderr  # nosec B101
+
+    async def feed() -> None:
+        if not process.stdin:
+            return
+        try:
+            if stdin:
+                process.stdin.write(stdin)
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def copy(stream: asyncio.StreamReader) -> None:
+        while chunk := await stream.read(CHUNK_SIZE):
+            stdout.write(chunk)
+
+    _, _, error = await asyncio.gather(
+        feed(), copy(process.stdout), process.stderr.read()
+    )
+    await process.wait()
+    return None, error
+
+
+async def kill(process: asyncio.subprocess.Process) -> None:
+    """Kill the process if it is still running, and reap it."""
+    if process.returncode is None:
+        process.kill()
+    await process.wait()
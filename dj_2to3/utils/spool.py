@@ -0,0 +1,129 @@
+"""
+The spooled capture of the outputs of the scripts.
+
+The output of a script for a big project, e.g. the diff of a fixer over the whole tree,
+can be hundreds of megabytes. It is copied in chunks into a spooled temporary file,
+which is held in memory up to the setting DJ_2TO3_SPOOL_SIZE and rolled over to disk
+beyond it, and its events are parsed one line at a time. The diffs of the files in the
+events are spooled the same way, into one spooled temporary file per fix.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import IO, Any
+
+from django.conf import settings
+
+CHUNK_SIZE = 1 << 16
+
+
+def open_spool(text: bool = False) -> IO[Any]:
+    """Open a spooled temporary file for the binary or the text output."""
+    if text:
+        return tempfile.SpooledTemporaryFile(
+            max_size=settings.DJ_2TO3_SPOOL_SIZE, mode="w+", encoding="utf-8"
+        )
+    return tempfile.SpooledTemporaryFile(max_size=settings.DJ_2TO3_SPOOL_SIZE)
+
+
+def iter_events(
+    lines: Iterable[str | bytes],
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Parse the JSON lines one at a time and yield their events.
+
+    Every event is also passed to the callback as soon as it is parsed.
+    """
+    for line in lines:
+        if line.strip():
+            event = json.loads(line)
+            if on_event:
+                on_event(event)
+            yield event
+
+
+def iter_spooled_events(spool: IO[bytes]) -> Iterator[dict[str, Any]]:
+    """Yield the events of the spool from its start, and close it at the end."""
+    with spool:
+        spool.seek(0)
+        yield from iter_events(spool)
+
+
+class SpooledDiffs(Mapping[str, str]):
+    """
+    The diffs of the files by one fix, spooled as they are added.
+
+    Only the offsets and the sizes of the diffs are held in memory, and a diff is read
+    back from the spool when it is accessed.
+    """
+
+    def __init__(self) -> None:
+        self.spool: IO[bytes] = open_spool()
+        self.index: dict[str, tuple[int, int]] = {}
+
+    def add(self, path: str, diff: str) -> None:
+        """Add the diff of the file, replacing the previous one if any."""
+        data = diff.encode()
+        self.spool.seek(0, os.SEEK_END)
+        self.index[path] = (self.spool.tell(), len(data))
+        self.spool.write(data)
+
+    def __getitem__(self, path: str) -> str:
+        offset, size = self.index[path]
+        self.spool.seek(offset)
+        return self.spool.read(size).decode()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        """Close the spool."""
+        self.spool.close()
+
+
+class SpooledFragments:
+    """
+    The diffs of the files by fix, spooled to one temporary file per fix.
+
+    The diffs of a fix are joined from its spool, so the diffs of all fixes are never
+    held in memory at once. The spools are closed when it is used as a context manager.
+    """
+
+    def __init__(self) -> None:
+        self.diffs: dict[str, SpooledDiffs] = {}
+
+    def __enter__(self) -> SpooledFragments:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add(self, fix: str, path: str, diff: str) -> None:
+        """Add the diff of the file by the fix."""
+        if fix not in self.diffs:
+            self.diffs[fix] = SpooledDiffs()
+        self.diffs[fix].add(path, diff)
+
+    def get(self, fix: str) -> Mapping[str, str]:
+        """Get the diffs of the files by the fix, read from its spool when accessed."""
+        return self.diffs[fix] if fix in self.diffs else {}
+
+    def update(self, other: SpooledFragments) -> None:
+        """Add the diffs of the other fragments, one diff at a time."""
+        for fix, diffs in other.diffs.items():
+            for path, diff in diffs.items():
+                self.add(fix, path, diff)
+
+    def close(self) -> None:
+        """Close the spools of all fixes."""
+        for diffs in self.diffs.values():
+            diffs.close()
+        self.diffs.clear()
@@ -0,0 +1,162 @@
+"""
+The pool of the warm workers of the Python executables.
+
+A worker is a long-lived process of a Python executable running the script ``worker``,
+which loads lib2to3, libfuturize and the other scripts once, and forks a child for every
+job, so the startup of the interpreter is paid once per worker instead of once per call.
+
+The idle workers are kept by the path of their Python executable, and a worker is
+replaced when it has been idle longer than the setting DJ_2TO3_WORKER_IDLE_TIMEOUT or
+has run the setting DJ_2TO3_WORKER_MAX_JOBS jobs. A worker exits by itself when it is
+left idle for twice the timeout, e.g. when the server is killed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import subprocess  # nosec B404
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+WORKER_PATH = Path(__file__).resolve().parent.parent / "scripts" / "worker.py"
+
+_lock = threading.Lock()
+_idle: dict[str, list[Worker]] = {}
+
+
+class Worker:
+    """The warm worker of a Python executable."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.jobs = 0
+        self.used = time.monotonic()
+        self.process = subprocess.Popen(  # nosec B603
+            [path, str(WORKER_PATH), str(2 * settings.DJ_2TO3_WORKER_IDLE_TIMEOUT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+
+    @property
+    def usable(self) -> bool:
+        """Check if the worker can still run a job."""
+        return (
+            self.process.poll() is None
+            and self.jobs < settings.DJ_2TO3_WORKER_MAX_JOBS
+            and time.monotonic() - self.used < settings.DJ_2TO3_WORKER_IDLE_TIMEOUT
+        )
+
+    def run(
+        self,
+        script: str,
+        payload: Any,
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Run the script with the payload and yield its events as they are read.
+
+        Every event is also passed to the callback as soon as it is read. The events are
+        not kept, so a big output is never held by the worker. A failed job is raised
+        the same way as the one of the script run alone.
+        """
+        assert self.process.stdin and self.process.stdout  # nosec B101
+        self.jobs += 1
+        self.process.stdin.write(json.dumps({"script": script, "payload": payload}))
+        self.process.stdin.write("\n")
+        self.process.stdin.flush()
+        for line in self.process.stdout:
+            if (event := json.loads(line))["type"] == "exit":
+                break
+            if on_event:
+                on_event(event)
+            yield event
+        else:
+            raise subprocess.CalledProcessError(
+                self.process.wait(),
+                self.process.args,
+                stderr="The worker is terminated.",
+            )
+        self.used = time.monotonic()
+        if event["returncode"]:
+            raise subprocess.CalledProcessError(
+                event["returncode"],
+                [self.path, str(WORKER_PATH.with_name(f"{script}.py"))],
+                stderr=event["stderr"],
+            )
+
+    def close(self) -> None:
+        """Stop the worker."""
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker, e.g. in the middle of a job."""
+        self.process.kill()
+        self.process.wait()
+
+
+def run_in_worker(
+    path: str,
+    script: str,
+    payload: Any,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Run the script with the payload by an idle worker of the Python executable.
+
+    The events are yielded as they are read. The worker is killed if they are not read
+    to the end.
+    """
+    worker = None
+    with _lock:
+        workers = _idle.get(path, [])
+        while workers:
+            if (worker := workers.pop()).usable:
+                break
+            worker.close()
+            worker = None
+    if worker is None:
+        worker = Worker(path)
+    try:
+        yield from worker.run(script, payload, on_event)
+    except subprocess.CalledProcessError:
+        release_worker(worker)
+        raise
+    except BaseException:
+        worker.kill()
+        raise
+    release_worker(worker)
+
+
+def release_worker(worker: Worker) -> None:
+    """Keep the worker for the next job, or stop it if it cannot run one."""
+    if not worker.usable:
+        worker.close()
+        return
+    with _lock:
+        _idle.setdefault(worker.path, []).append(worker)
+
+
+def close_workers(path: str | None = None) -> None:
+    """Stop the idle workers of the Python executable, or all of them."""
+    with _lock:
+        workers = _idle.pop(path, []) if path else sum(_idle.values(), [])
+        if not path:
+            _idle.clear()
+    for worker in workers:
+        worker.close()
+
+
+atexit.register(close_workers)
@@ -0,0 +1,5 @@
+"""All views in this application."""
+
+from .job import job_events
+
+__all__ = ["job_events"]
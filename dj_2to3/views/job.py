@@ -0,0 +1,38 @@
+"""The views of the model of Job."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+
+from ..models import Job
+
+POLL_INTERVAL = 1.0
+
+
+async def job_events(request: HttpRequest, pk: int) -> HttpResponseBase:
+    """
+    Stream the progress of the job as Server-Sent Events until it is finished.
+
+    The view is asynchronous, so an ASGI server holds no thread for a subscriber while
+    the job is polled.
+    """
+    user = await request.auser()
+    if not user.is_active or not user.is_staff:
+        return HttpResponse(status=403)
+
+    async def stream() -> AsyncIterator[str]:
+        while (job := await Job.objects.filter(pk=pk).afirst()) is not None:
+            yield f"data: {json.dumps(job.get_progress())}\n\n"
+            if job.status in (Job.Status.SUCCEEDED, Job.Status.FAILED):
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+        yield "event: error\ndata: {}\n\n"
+
+    return StreamingHttpResponse(
+        stream(),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )